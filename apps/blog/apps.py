@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class BlogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.blog"
+
+    def ready(self):
+        # Connect model signal receivers
+        from apps.blog import signals  # noqa: F401
+        from apps.blog.templatetags.svg_tags import preload_svgs
+
+        preload_svgs()
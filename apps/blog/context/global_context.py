@@ -1,10 +1,20 @@
+import time
+
+from django.conf import settings
+
 from apps.blog.models import User
+from services.redis import CACHE_PREFIXES, RedisCacheHandler
 
+ROOT_USER_CACHE_NAME = "root_user"
+ROOT_USER_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day, invalidated on User/Profile save
 
-def shared(_request):
-    """
-    Global context processor to add common variables to all templates.
-    """
+_cache = RedisCacheHandler(CACHE_PREFIXES["CONTEXT"], ROOT_USER_CACHE_TIMEOUT)
+
+# Per-process copy: (snapshot, expires_at monotonic timestamp)
+_local_snapshot: tuple[dict | None, float] = (None, 0.0)
+
+
+def _build_root_user_snapshot() -> dict:
     root_user = User.objects.select_related("profile").first()
     if root_user is None:
         raise ValueError(
@@ -18,3 +28,42 @@ def shared(_request):
         "linkedin_link": root_user.profile.linkedin_link,
         "avatar": root_user.profile.avatar.url if root_user.profile.avatar else None,
     }
+
+
+def get_root_user_snapshot() -> dict:
+    """
+    Return the root user/profile values shared by every template, looking in
+    the process memory first, then Redis, then the database.
+    """
+    global _local_snapshot  # noqa: PLW0603
+
+    snapshot, expires_at = _local_snapshot
+    now = time.monotonic()
+    if snapshot is not None and now < expires_at:
+        return snapshot
+
+    snapshot = _cache.get(ROOT_USER_CACHE_NAME)
+    if snapshot is None:
+        snapshot = _build_root_user_snapshot()
+        _cache.set_cache(ROOT_USER_CACHE_NAME, snapshot)
+
+    _local_snapshot = (snapshot, now + settings.SHARED_CONTEXT_LOCAL_TTL)
+    return snapshot
+
+
+def invalidate_root_user_snapshot():
+    """
+    Drop the cached snapshot in Redis and in this process. Other workers pick
+    up the change once their local copy expires.
+    """
+    global _local_snapshot  # noqa: PLW0603
+
+    _local_snapshot = (None, 0.0)
+    _cache.delete(ROOT_USER_CACHE_NAME)
+
+
+def shared(_request):
+    """
+    Global context processor to add common variables to all templates.
+    """
+    return dict(get_root_user_snapshot())
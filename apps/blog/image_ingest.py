@@ -0,0 +1,217 @@
+"""
+Background ingestion of images uploaded from the TinyMCE editor.
+
+The original upload is stored right away under uploads/originals/ and its URL
+is handed back to the editor. A background worker then converts it to WebP
+under uploads/<name>.webp and records the new location in Redis, where the
+editor polls for it. Posts still referencing an original once its WebP is
+ready are rewritten, so published pages end up serving the optimized file.
+
+Originals are never overwritten in place: nginx caches media for 30 days.
+
+Conversions run on background threads which die with their web worker, so
+pending statuses carry a heartbeat. One not renewed within
+PENDING_STALE_AFTER is reported as failed, and uploading the image again
+starts a new conversion.
+"""
+
+import io
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, UnidentifiedImageError
+
+from services.background import BackgroundExecutor
+from services.image_conversion_cache import convert_image_to_webp_cached
+from services.redis import CACHE_PREFIXES, RedisCacheHandler
+from utilities.content_hash import content_hash
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+STATUS_TIMEOUT = 60 * 60 * 24 * 7  # 1 week
+# Longest a live conversion goes without renewing its heartbeat: the wait for
+# a pool slot plus the conversion itself, with some margin.
+PENDING_STALE_AFTER = (
+    settings.IMAGE_INGEST_SLOT_WAIT + settings.IMAGE_POOL_TIMEOUT + 60 * 5
+)
+
+CONVERSION_OPTIONS = {"quality": 85, "max_width": 2048, "max_height": 2048}
+
+ORIGINALS_PREFIX = f"{settings.DEFAULT_UPLOAD_PREFIX}originals/"
+ORIGINAL_URL_PATTERN = re.compile(
+    rf"/{re.escape(settings.SEAWEEDFS_PREFIX)}/{re.escape(ORIGINALS_PREFIX)}"
+    r"(?P<key>[0-9a-f]{32})\.[A-Za-z0-9]+"
+)
+
+_status = RedisCacheHandler(CACHE_PREFIXES["IMAGES"], STATUS_TIMEOUT)
+
+_executor = BackgroundExecutor("image-ingest", settings.IMAGE_INGEST_WORKERS)
+
+
+def _webp_name(key: str) -> str:
+    return f"{settings.DEFAULT_UPLOAD_PREFIX}{key}.webp"
+
+
+def _set_pending(key: str, original_url: str) -> dict:
+    status = {
+        "status": STATUS_PENDING,
+        "location": original_url,
+        "heartbeat": time.time(),
+    }
+    _status.set_cache(key, status)
+    return status
+
+
+def _get_status(key: str) -> dict | None:
+    status = _status.get(key)
+    if (
+        status is not None
+        and status["status"] == STATUS_PENDING
+        and time.time() - status.get("heartbeat", 0) > PENDING_STALE_AFTER
+    ):
+        # Lost with the worker that was running it
+        return {
+            "status": STATUS_FAILED,
+            "location": status["location"],
+            "error": "Image conversion was interrupted.",
+        }
+    return status
+
+
+def identify_image(image_bytes: bytes) -> str | None:
+    """
+    Cheap header-only check run in the request, so obviously broken uploads
+    are still rejected before anything is stored. Returns an error message.
+    """
+    try:
+        with Image.open(io.BytesIO(image_bytes)):
+            return None
+    except UnidentifiedImageError:
+        return (
+            "Unable to identify image format. "
+            "The file may be corrupted or not a valid image."
+        )
+    except Image.DecompressionBombError:
+        return "Image is too large and may be a decompression bomb attack."
+
+
+def ingest_image(image_bytes: bytes, ext: str) -> dict:
+    """
+    Store the original and schedule its WebP conversion. Returns the status
+    of the upload, whose location is usable by the editor straight away.
+
+    Names are a hash of the source bytes and conversion options, so an image
+    that was already ingested is returned as is, without any new work.
+    """
+    key = content_hash(image_bytes, format="webp", **CONVERSION_OPTIONS)
+    status = _get_status(key)
+    if status is not None and status["status"] != STATUS_FAILED:
+        return status
+
+    webp_path = default_storage.stored_name(_webp_name(key))
+    if default_storage.exists(webp_path):
+        status = {"status": STATUS_READY, "location": f"/{webp_path}"}
+        _status.set_cache(key, status)
+        return status
+
+    original_path = default_storage.save_if_missing(
+        f"{ORIGINALS_PREFIX}{key}{ext.lower()}", ContentFile(image_bytes)
+    )
+    original_url = f"/{original_path}"
+
+    status = _set_pending(key, original_url)
+    _executor.submit(_convert, key, original_url, image_bytes)
+    return status
+
+
+def _convert(key: str, original_url: str, image_bytes: bytes):
+    # Time spent queued behind other uploads doesn't count towards staleness
+    _set_pending(key, original_url)
+    try:
+        webp_bytes, error_msg = convert_image_to_webp_cached(
+            image_bytes,
+            max_pixels=settings.IMAGE_MAX_DECODE_PIXELS,
+            # Nobody waits on this thread: queue for the pool, don't give up
+            wait_for_slot=settings.IMAGE_INGEST_SLOT_WAIT,
+            **CONVERSION_OPTIONS,
+        )
+        if error_msg:
+            logger.warning(
+                "Image ingestion failed, keeping the original",
+                extra={"location": original_url, "error": error_msg},
+            )
+            _status.set_cache(
+                key,
+                {"status": STATUS_FAILED, "location": original_url, "error": error_msg},
+            )
+            return
+
+        webp_path = default_storage.save(_webp_name(key), ContentFile(webp_bytes))
+        webp_url = f"/{webp_path}"
+        _status.set_cache(key, {"status": STATUS_READY, "location": webp_url})
+        logger.info(
+            "Image ingested",
+            extra={"original": original_url, "location": webp_url},
+        )
+        _rewrite_posts(original_url)
+    except Exception:
+        logger.exception("Image ingestion failed", extra={"location": original_url})
+        _status.set_cache(key, {"status": STATUS_FAILED, "location": original_url})
+    finally:
+        close_old_connections()
+
+
+def _rewrite_posts(original_url: str):
+    """
+    Point posts saved before the conversion finished at the WebP. Saving
+    goes through the model signals, so their cached pages are purged too.
+
+    Only the content is written back, from rows locked while it is
+    rewritten, so an edit committed from the admin meanwhile isn't lost.
+    """
+    from apps.blog.models import Posts
+
+    with transaction.atomic():
+        posts = Posts.objects.select_for_update().filter(content__contains=original_url)
+        for post in posts:
+            # The pre_save signal swaps in the WebP URL
+            post.save(update_fields=["content", "modified"])
+
+
+def get_ingest_status(location: str) -> dict | None:
+    """
+    Status of the image uploaded at ``location``:
+    {"status": "pending" | "ready" | "failed", "location": <current URL>}.
+    """
+    match = ORIGINAL_URL_PATTERN.fullmatch(location)
+    if match is None:
+        return None
+    return _get_status(match["key"])
+
+
+def rewrite_ingested_urls(html: str) -> str:
+    """
+    Replace the URLs of originals whose WebP is ready.
+    """
+    keys = {match["key"] for match in ORIGINAL_URL_PATTERN.finditer(html)}
+    if not keys:
+        return html
+
+    statuses = _status.get_many(list(keys))
+
+    def replace(match: re.Match) -> str:
+        status = statuses.get(match["key"])
+        if status and status["status"] == STATUS_READY:
+            return status["location"]
+        return match.group(0)
+
+    return ORIGINAL_URL_PATTERN.sub(replace, html)
@@ -0,0 +1,142 @@
+import tracemalloc
+from dataclasses import asdict, field, fields, make_dataclass
+from datetime import UTC, datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from django_redis.serializers.json import JSONSerializer
+
+from apps.blog.views.projects.dto.projects import GithubProjectDto
+from utilities.benchmark import measure, summarize, write_results
+
+# The DTO as it was before, with a per-instance __dict__
+DictGithubProjectDto = make_dataclass(
+    "DictGithubProjectDto",
+    [(f.name, f.type, field(default=f.default)) for f in fields(GithubProjectDto)],
+)
+
+# What django-redis stores the cache entries with
+serializer = JSONSerializer({})
+
+
+def generate_repositories(count: int) -> list[dict]:
+    """
+    GitHub API-like repositories, only with the fields the DTO keeps.
+    """
+    created = datetime(2020, 1, 1, tzinfo=UTC)
+    return [
+        {
+            "id": 100_000_000 + index,
+            "name": f"project-{index}",
+            "html_url": f"https://github.com/octocat/project-{index}",
+            "stargazers_count": index * 7 % 500,
+            "forks": index % 40,
+            "topics": ["django", "python", f"topic-{index % 10}"],
+            "created_at": (created + timedelta(hours=index)).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+            "description": None if index % 5 == 0 else f"Project number {index}",
+        }
+        for index in range(count)
+    ]
+
+
+def decode_dicts(payload: bytes) -> list:
+    """
+    Baseline: a list of to_dict() dicts, created_at parsed for every project.
+    """
+    return [
+        DictGithubProjectDto(
+            **{**project, "created_at": parse_datetime(project["created_at"])}
+        )
+        for project in serializer.loads(payload)
+    ]
+
+
+def decode_records(payload: bytes) -> list:
+    return [
+        GithubProjectDto.from_record(record) for record in serializer.loads(payload)
+    ]
+
+
+def encode_dicts(repositories: list[dict]) -> bytes:
+    return serializer.dumps(
+        [GithubProjectDto.from_dict(repo).to_dict() for repo in repositories]
+    )
+
+
+def encode_records(repositories: list[dict]) -> bytes:
+    return serializer.dumps(
+        [GithubProjectDto.from_dict(repo).to_record() for repo in repositories]
+    )
+
+
+FORMATS = {
+    "dicts": (encode_dicts, decode_dicts),
+    "records": (encode_records, decode_records),
+}
+
+
+def retained_bytes(fn, *args) -> int:
+    """
+    Memory still allocated by what fn(*args) returns.
+    """
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the GitHub projects cache formats: the previous list of "
+        "dicts with ISO dates against compact GithubProjectDto records. "
+        "Measures payload size, encode and cache hit (decode + DTOs) latency "
+        "and the memory held by the decoded DTOs. Results are saved as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repositories", nargs="+", type=int, default=[100, 250, 500, 1000]
+        )
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument("--output", default="github_projects_cache_benchmark.json")
+
+    def handle(self, *_args, **options):
+        results = []
+        for count in options["repositories"]:
+            repositories = generate_repositories(count)
+            expected = [
+                asdict(GithubProjectDto.from_dict(repo)) for repo in repositories
+            ]
+            for format_name, (encode, decode) in FORMATS.items():
+                payload = encode(repositories)
+                if [asdict(dto) for dto in decode(payload)] != expected:
+                    raise CommandError(f"{format_name} doesn't round-trip")
+                encoding = measure(encode, (repositories,), repeat=options["repeat"])
+                decoding = measure(decode, (payload,), repeat=options["repeat"])
+                result = {
+                    "repositories": count,
+                    "format": format_name,
+                    "payload_bytes": len(payload),
+                    "encode": summarize(encoding["latencies"]),
+                    "decode": summarize(decoding["latencies"]),
+                    "decoded_bytes": retained_bytes(decode, payload),
+                }
+                results.append(result)
+                self.stdout.write(
+                    f"{count:>5} repos {format_name:<8} "
+                    f"payload {len(payload) / 1e3:7.1f} kB  "
+                    f"encode p50 {result['encode']['p50_ms']:>7} ms  "
+                    f"decode p50 {result['decode']['p50_ms']:>7} ms  "
+                    f"p95 {result['decode']['p95_ms']:>7} ms  "
+                    f"DTOs {result['decoded_bytes'] / 1e3:7.1f} kB"
+                )
+
+        params = {key: options[key] for key in ("repositories", "repeat")}
+        write_results(options["output"], "github_projects_cache", params, results)
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {options['output']}"))
@@ -0,0 +1,174 @@
+import itertools
+import math
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from utilities.benchmark import measure_isolated, summarize, write_results
+from utilities.convert_image_to_webp import convert_image_to_webp
+
+IMAGE_KINDS = ["jpeg", "png", "gif", "palette", "rgba"]
+
+
+def generate_image(kind: str, megapixels: float, path: Path):
+    """
+    Write a 4:3 test image mixing gradients (which compress well) and noise
+    (which doesn't), so encoders get photo-like work rather than flat color.
+    """
+    width = round(math.sqrt(megapixels * 1_000_000 * 4 / 3))
+    height = round(width * 3 / 4)
+    size = (width, height)
+    image = Image.merge(
+        "RGB",
+        [
+            Image.linear_gradient("L").resize(size),
+            Image.effect_noise(size, 48),
+            Image.radial_gradient("L").resize(size),
+        ],
+    )
+
+    if kind == "jpeg":
+        image.save(path, format="JPEG", quality=90)
+    elif kind == "png":
+        image.save(path, format="PNG", compress_level=1)
+    elif kind == "gif":
+        image.quantize(256).save(path, format="GIF")
+    elif kind == "palette":
+        image.quantize(256).save(path, format="PNG", compress_level=1)
+    elif kind == "rgba":
+        image.putalpha(Image.linear_gradient("L").rotate(90).resize(size))
+        image.save(path, format="PNG", compress_level=1)
+
+
+def convert_file(path: str, **options) -> tuple[int | None, str | None]:
+    """
+    Benchmarked job: convert a corpus file, return the output size.
+    """
+    with open(path, "rb") as image_file:
+        image_data = image_file.read()
+    webp_bytes, error = convert_image_to_webp(image_data, **options)
+    return (len(webp_bytes) if webp_bytes else None), error
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark convert_image_to_webp over a generated corpus, for every "
+        "quality/method/max-size combination. Each input is converted in a "
+        "fresh process so peak RSS is its own. Results are saved as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kinds", nargs="+", choices=IMAGE_KINDS, default=IMAGE_KINDS
+        )
+        parser.add_argument("--megapixels", nargs="+", type=float, default=[1, 12, 50])
+        parser.add_argument("--quality", nargs="+", type=int, default=[75, 85])
+        parser.add_argument("--method", nargs="+", type=int, default=[4, 6])
+        parser.add_argument(
+            "--max-size",
+            nargs="+",
+            type=int,
+            default=[2048],
+            help="Maximum width/height, 0 to keep the original size.",
+        )
+        parser.add_argument(
+            "--max-pixels",
+            type=int,
+            default=0,
+            help="Decoding budget passed to the converter, 0 for none.",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--corpus-dir",
+            default="/tmp/image-conversion-corpus",
+            help="Generated inputs are kept here and reused by later runs.",
+        )
+        parser.add_argument("--output", default="image_conversion_benchmark.json")
+
+    def handle(self, *_args, **options):
+        corpus = self.build_corpus(
+            Path(options["corpus_dir"]), options["kinds"], options["megapixels"]
+        )
+
+        results = []
+        combinations = itertools.product(
+            options["quality"], options["method"], options["max_size"]
+        )
+        for quality, method, max_size in combinations:
+            conversion_options = {
+                "quality": quality,
+                "method": method,
+                "max_width": max_size or None,
+                "max_height": max_size or None,
+                "max_pixels": options["max_pixels"] or None,
+            }
+            inputs = []
+            for path in corpus:
+                run = measure_isolated(
+                    convert_file,
+                    (str(path),),
+                    conversion_options,
+                    repeat=options["repeat"],
+                )
+                output_bytes, error = run["result"]
+                inputs.append(
+                    {
+                        "input": path.name,
+                        "source_bytes": path.stat().st_size,
+                        "output_bytes": output_bytes,
+                        "error": error,
+                        "peak_rss_bytes": run["peak_rss_bytes"],
+                        "rss_growth_bytes": run["peak_rss_bytes"]
+                        - run["baseline_rss_bytes"],
+                        "latencies": run["latencies"],
+                        **summarize(run["latencies"]),
+                    }
+                )
+
+            result = {
+                "quality": quality,
+                "method": method,
+                "max_size": max_size,
+                **summarize([lat for row in inputs for lat in row["latencies"]]),
+                "output_bytes": sum(row["output_bytes"] or 0 for row in inputs),
+                "errors": sum(1 for row in inputs if row["error"]),
+                "peak_rss_bytes": max(row["peak_rss_bytes"] for row in inputs),
+                "inputs": inputs,
+            }
+            results.append(result)
+            self.stdout.write(
+                f"q={quality:<3} method={method} max={max_size or '-':<5} "
+                f"{result['per_second']:>7} img/s  "
+                f"p50 {result['p50_ms']:>9} ms  p95 {result['p95_ms']:>9} ms  "
+                f"out {result['output_bytes'] / 1e6:8.2f} MB  "
+                f"peak RSS {result['peak_rss_bytes'] / 1e6:8.1f} MB  "
+                f"errors {result['errors']}"
+            )
+
+        params = {
+            key: options[key]
+            for key in (
+                "kinds",
+                "megapixels",
+                "quality",
+                "method",
+                "max_size",
+                "max_pixels",
+                "repeat",
+            )
+        }
+        write_results(options["output"], "image_conversion", params, results)
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {options['output']}"))
+
+    def build_corpus(self, directory: Path, kinds, megapixels) -> list[Path]:
+        directory.mkdir(parents=True, exist_ok=True)
+        extensions = {"jpeg": "jpg", "gif": "gif"}
+        corpus = []
+        for kind, size in itertools.product(kinds, megapixels):
+            path = directory / f"{kind}-{size:g}mp.{extensions.get(kind, 'png')}"
+            if not path.exists():
+                self.stdout.write(f"Generating {path.name}")
+                generate_image(kind, size, path)
+            corpus.append(path)
+        return corpus
@@ -0,0 +1,111 @@
+import itertools
+
+from defusedxml.ElementTree import fromstring
+from django.core.management.base import BaseCommand
+
+from utilities.benchmark import measure_isolated, summarize, write_results
+from utilities.defused_svg import is_safe_svg, sanitize_svg
+
+VARIANTS = ["clean", "bad_first", "bad_last"]
+
+ICON = (
+    '<g id="icon-{index}" fill="none" stroke="currentColor" stroke-width="2">'
+    '<path d="M3 12h18M12 3v18M5.6 5.6l12.8 12.8"/>'
+    '<circle cx="12" cy="12" r="9"/>'
+    '<use xlink:href="#icon-0" x="{index}"/>'
+    "</g>"
+)
+
+
+def generate_svg(icons: int, variant: str) -> bytes:
+    """
+    An icon sheet of ``icons`` groups, 4 elements each. bad_first starts with
+    a script, bad_last ends with an event handler.
+    """
+    parts = [
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        'xmlns:xlink="http://www.w3.org/1999/xlink" viewBox="0 0 24 24">'
+    ]
+    if variant == "bad_first":
+        parts.append("<script>alert(1)</script>")
+    parts.extend(ICON.format(index=index) for index in range(icons))
+    if variant == "bad_last":
+        parts.append('<rect onclick="alert(1)" width="1" height="1"/>')
+    parts.append("</svg>")
+    return "".join(parts).encode()
+
+
+def full_tree_walk(svg_bytes: bytes) -> tuple[bool, str]:
+    """
+    Baseline: materialize the whole tree, then visit every element.
+    """
+    root = fromstring(svg_bytes)
+    for elem in root.iter():
+        if elem.tag.endswith("script") or any(
+            name.lower().startswith("on") for name in elem.attrib
+        ):
+            return False, "violation"
+    return True, ""
+
+
+CHECKS = {
+    "full_tree": full_tree_walk,
+    "validate": is_safe_svg,
+    "sanitize": sanitize_svg,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the streaming SVG validator and sanitizer against a full "
+        "tree walk, on generated icon sheets that are clean, start with a "
+        "violation or end with one. Results are saved as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--icons",
+            nargs="+",
+            type=int,
+            default=[100, 1000, 10000],
+            help="Icon groups per SVG, 4 elements each.",
+        )
+        parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--output", default="svg_validation_benchmark.json")
+
+    def handle(self, *_args, **options):
+        results = []
+        for icons, variant in itertools.product(options["icons"], options["variants"]):
+            svg_bytes = generate_svg(icons, variant)
+            for check_name, check in CHECKS.items():
+                # Limits out of the way, this measures parsing and checks only
+                kwargs = {}
+                if check is not full_tree_walk:
+                    kwargs = {
+                        "max_bytes": len(svg_bytes),
+                        "max_elements": icons * 4 + 10,
+                    }
+                run = measure_isolated(
+                    check, (svg_bytes,), kwargs, repeat=options["repeat"]
+                )
+                result = {
+                    "icons": icons,
+                    "variant": variant,
+                    "check": check_name,
+                    "svg_bytes": len(svg_bytes),
+                    **summarize(run["latencies"]),
+                    "rss_growth_bytes": run["peak_rss_bytes"]
+                    - run["baseline_rss_bytes"],
+                    "peak_rss_bytes": run["peak_rss_bytes"],
+                }
+                results.append(result)
+                self.stdout.write(
+                    f"{icons:>6} icons {variant:<9} {check_name:<9} "
+                    f"p50 {result['p50_ms']:>9} ms  p95 {result['p95_ms']:>9} ms  "
+                    f"RSS +{result['rss_growth_bytes'] / 1e6:6.1f} MB"
+                )
+
+        params = {key: options[key] for key in ("icons", "variants", "repeat")}
+        write_results(options["output"], "svg_validation", params, results)
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {options['output']}"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.models import Posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the responsive renditions of every post thumbnail, e.g. for "
+        "thumbnails uploaded before IMAGE_RENDITION_WIDTHS/FORMATS changed or "
+        "before their width was recorded."
+    )
+
+    def handle(self, *_args, **_options):
+        posts = Posts.objects.exclude(thumbnail="").exclude(thumbnail__isnull=True)
+        for post in posts.iterator():
+            thumbnail = post.thumbnail
+            with thumbnail.open("rb") as image_file:
+                image_data = image_file.read()
+            thumbnail.save_renditions(image_data)
+            # Backfills the width of thumbnails saved before it was recorded
+            post.save(update_fields=["thumbnail_width"])
+            self.stdout.write(f"Built renditions for {post.slug}")
+
+        self.stdout.write(self.style.SUCCESS("Done"))
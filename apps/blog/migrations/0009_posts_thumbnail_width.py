@@ -0,0 +1,24 @@
+# Generated by Django 5.2.10 on 2026-10-17 21:11
+
+import apps.blog.models.abstract.webp_image_field
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_alter_posts_thumbnail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='posts',
+            name='thumbnail_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='posts',
+            name='thumbnail',
+            field=apps.blog.models.abstract.webp_image_field.WebPImageField(blank=True, null=True, source_width_field='thumbnail_width', upload_to='posts/thumbnails/'),
+        ),
+    ]
@@ -1,40 +1,210 @@
+import io
 import logging
 import os
-import uuid
 
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.db import models
 from django.db.models.fields.files import ImageFieldFile
+from PIL import Image
 
-from utilities.convert_image_to_webp import convert_image_to_webp
+from services.image_conversion_cache import convert_image_to_webp_cached
+from services.image_pool import run_image_job
+from utilities.content_hash import content_hash
+from utilities.convert_image_to_webp import convert_image_renditions
 
 logger = logging.getLogger(__name__)
 
 
+def rendition_name(name: str, width: int, rendition_format: str) -> str:
+    """
+    posts/thumbnails/<uuid>.webp -> posts/thumbnails/<uuid>-640w.avif
+    """
+    return f"{os.path.splitext(name)[0]}-{width}w.{rendition_format}"
+
+
 class WebPImageFieldFile(ImageFieldFile):
-    def save(self, name, content, save=True):
-        webp_bytes, error = convert_image_to_webp(
-            image_data=content.read(),
+    @property
+    def source_width(self) -> int | None:
+        """
+        Width of the image the renditions were made from, when the model
+        records it (see WebPImageField.source_width_field).
+        """
+        if not self.field.source_width_field:
+            return None
+        return getattr(self.instance, self.field.source_width_field)
+
+    def _set_source_width(self, image_data: bytes):
+        if self.field.source_width_field:
+            # Header only, the image isn't decoded
+            with Image.open(io.BytesIO(image_data)) as image:
+                setattr(self.instance, self.field.source_width_field, image.width)
+
+    @property
+    def renditions(self) -> dict[str, list[tuple[str, int]]]:
+        """
+        URLs of the responsive renditions stored next to this file, as
+        {format: [(url, width), ...]} ordered by width.
+
+        Images aren't upscaled: renditions configured wider than the source
+        were encoded at its width, so only the first of them is listed, with
+        that width. Without a recorded source width, every configured width
+        is listed as is.
+        """
+        source_width = self.source_width
+        widths = []
+        for width in sorted(settings.IMAGE_RENDITION_WIDTHS):
+            if source_width and width >= source_width:
+                widths.append((width, source_width))
+                break
+            widths.append((width, width))
+
+        return {
+            rendition_format: [
+                (
+                    self.storage.url(
+                        rendition_name(self.name, width, rendition_format)
+                    ),
+                    encoded_width,
+                )
+                for width, encoded_width in widths
+            ]
+            for rendition_format in settings.IMAGE_RENDITION_FORMATS
+        }
+
+    def save_renditions(self, image_data: bytes):
+        """
+        Store the configured width/format set under this file's base name,
+        and record the source width on the instance. Saving it is up to the
+        caller.
+        """
+        # Stored names carry the storage prefix, storage.save() adds it back
+        name = self.name.removeprefix(f"{getattr(self.storage, 'prefix', '')}/")
+        renditions, error = run_image_job(
+            convert_image_renditions,
+            image_data,
+            widths=settings.IMAGE_RENDITION_WIDTHS,
+            formats=settings.IMAGE_RENDITION_FORMATS,
             quality=85,
-            max_width=2048,
-            max_height=2048,
+            max_pixels=settings.IMAGE_MAX_DECODE_PIXELS,
+            # Saved from the admin: queue briefly for a busy pool
+            wait_for_slot=settings.IMAGE_ADMIN_SLOT_WAIT,
         )
-
         if error:
-            logger.error(f"Failed to convert {name} to WebP: {error}")
+            logger.error(f"Failed to generate renditions for {self.name}: {error}")
             raise ValueError(f"Image conversion failed: {error}")
 
+        for (width, rendition_format), data in renditions.items():
+            self.storage.save(
+                rendition_name(name, width, rendition_format), ContentFile(data)
+            )
+        self._set_source_width(image_data)
+
+    def save(self, name, content, save=True):
+        image_data = content.read()
+
+        # Named after the source bytes and every conversion setting, so the
+        # same upload maps to the same objects and is never converted twice.
         folder = os.path.dirname(name)
-        unique_filename = f"{uuid.uuid4().hex}.webp"
+        unique_filename = (
+            content_hash(
+                image_data,
+                format="webp",
+                quality=85,
+                max_size=2048,
+                rendition_widths=sorted(settings.IMAGE_RENDITION_WIDTHS),
+                rendition_formats=settings.IMAGE_RENDITION_FORMATS,
+            )
+            + ".webp"
+        )
 
         if folder:
             webp_name = os.path.join(folder, unique_filename)
         else:
             webp_name = unique_filename
 
+        stored_name = self.storage.stored_name(
+            self.field.generate_filename(self.instance, webp_name)
+        )
+        if self.storage.exists(stored_name):
+            logger.info(f"Reusing stored {stored_name} for {name}")
+            self.name = stored_name
+            setattr(self.instance, self.field.attname, self.name)
+            # Its renditions were made from the same bytes
+            self._set_source_width(image_data)
+            self._committed = True
+            if save:
+                self.instance.save()
+            return
+
+        webp_bytes, error = convert_image_to_webp_cached(
+            image_data=image_data,
+            quality=85,
+            max_width=2048,
+            max_height=2048,
+            max_pixels=settings.IMAGE_MAX_DECODE_PIXELS,
+            wait_for_slot=settings.IMAGE_ADMIN_SLOT_WAIT,
+        )
+
+        if error:
+            logger.error(f"Failed to convert {name} to WebP: {error}")
+            raise ValueError(f"Image conversion failed: {error}")
+
         webp_content = ContentFile(webp_bytes)
-        super().save(webp_name, webp_content, save)
+        super().save(webp_name, webp_content, save=False)
+        self.save_renditions(image_data)
+
+        if save:
+            self.instance.save()
+
+    def delete(self, save=True):
+        if not self:
+            return
+
+        # Identical uploads share their files, keep them while still in use
+        shared = (
+            type(self.instance)
+            ._default_manager.filter(**{self.field.name: self.name})
+            .exclude(pk=self.instance.pk)
+            .exists()
+        )
+        if shared:
+            self.name = None
+            setattr(self.instance, self.field.attname, self.name)
+            self._committed = False
+            if save:
+                self.instance.save()
+            return
+
+        for rendition_format in settings.IMAGE_RENDITION_FORMATS:
+            for width in settings.IMAGE_RENDITION_WIDTHS:
+                try:
+                    self.storage.delete(
+                        rendition_name(self.name, width, rendition_format)
+                    )
+                except Exception:
+                    # Files saved before renditions existed have none
+                    logger.warning(f"Missing {width}w {rendition_format} rendition")
+        super().delete(save)
 
 
 class WebPImageField(models.ImageField):
+    """
+    ImageField storing uploads as WebP, plus responsive renditions.
+
+    ``source_width_field`` names an optional integer field of the model where
+    the width of the image the renditions are made from is recorded, so
+    srcsets advertise the widths that were actually encoded.
+    """
+
     attr_class = WebPImageFieldFile
+
+    def __init__(self, *args, source_width_field: str | None = None, **kwargs):
+        self.source_width_field = source_width_field
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.source_width_field:
+            kwargs["source_width_field"] = self.source_width_field
+        return name, path, args, kwargs
@@ -1,4 +1,42 @@
 class GithubRepository:
+    # A fixed set of attributes, no per-instance __dict__
+    __slots__ = (
+        "clone_url",
+        "created_at",
+        "default_branch",
+        "description",
+        "fork",
+        "forks_count",
+        "full_name",
+        "git_url",
+        "has_downloads",
+        "has_issues",
+        "has_pages",
+        "has_projects",
+        "has_wiki",
+        "homepage",
+        "html_url",
+        "id",
+        "language",
+        "name",
+        "node_id",
+        "open_issues_count",
+        "owner_avatar_url",
+        "owner_html_url",
+        "owner_id",
+        "owner_login",
+        "owner_node_id",
+        "private",
+        "pushed_at",
+        "size",
+        "ssh_url",
+        "stargazers_count",
+        "svn_url",
+        "updated_at",
+        "url",
+        "watchers_count",
+    )
+
     def __init__(self, **kwargs):
         self.id = kwargs.get("id")
         self.node_id = kwargs.get("node_id")
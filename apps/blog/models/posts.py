@@ -47,7 +47,14 @@ class Posts(TimeStampedModel, UUIDModel):
     tags = TaggableManager(through=UUIDTaggedItem)
     table_of_contents = HTMLField(blank=True, null=True)
 
-    thumbnail = WebPImageField(upload_to="posts/thumbnails/", blank=True, null=True)
+    thumbnail = WebPImageField(
+        upload_to="posts/thumbnails/",
+        blank=True,
+        null=True,
+        source_width_field="thumbnail_width",
+    )
+    # After thumbnail: it is set while the thumbnail field is being saved
+    thumbnail_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
 
     meta_title = models.CharField(
         max_length=70, blank=True, help_text="Custom title tag for SEO (max 70 chars)"
@@ -0,0 +1,110 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.blog.context.global_context import invalidate_root_user_snapshot
+from apps.blog.image_ingest import rewrite_ingested_urls
+from apps.blog.models import (
+    Certification,
+    Education,
+    Posts,
+    Profile,
+    Projects,
+    Resume,
+    User,
+    WorkExperience,
+)
+from apps.blog.views.about import invalidate_resolved_about
+from apps.blog.views.resume.services import resume_pdf_service
+from services.page_cache import (
+    POSTS_LIST_KEY,
+    PROFILE_KEY,
+    RESUME_KEY,
+    post_key,
+    purge_surrogate_keys,
+)
+
+
+def _purge_on_commit(*keys):
+    # Purging before the transaction commits would let a concurrent request
+    # re-cache the old rows under the new token. Requests already rendering
+    # when the purge lands are covered by the page cache itself: they store
+    # under the tokens read before rendering, i.e. the old ones.
+    transaction.on_commit(lambda: purge_surrogate_keys(*keys))
+
+
+def _invalidate_root_user_caches():
+    invalidate_root_user_snapshot()
+    invalidate_resolved_about()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_root_user_context(update_fields=None, **_kwargs):
+    """
+    Refresh the cached context processor values when the root user changes.
+    """
+    # Every admin login saves last_login, which none of the pages render
+    if update_fields == {"last_login"}:
+        return
+    # Dropped before commit, they would be rebuilt from the old rows
+    transaction.on_commit(_invalidate_root_user_caches)
+    _purge_on_commit(PROFILE_KEY)
+    # The PDF header shows the root user's name and links
+    transaction.on_commit(resume_pdf_service.refresh)
+
+
+@receiver(pre_save, sender=Posts)
+def use_ingested_images(instance, **_kwargs):
+    """
+    Swap editor uploads whose WebP conversion has finished into the content.
+    """
+    if instance.content:
+        instance.content = rewrite_ingested_urls(instance.content)
+
+
+@receiver(pre_save, sender=Posts)
+def remember_previous_slug(instance, **_kwargs):
+    # The page cached under the old URL has to be purged on a slug change
+    instance._previous_slug = (
+        Posts.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Posts)
+@receiver(post_delete, sender=Posts)
+def invalidate_post_pages(instance, **_kwargs):
+    keys = {post_key(instance.slug), POSTS_LIST_KEY}
+    previous_slug = getattr(instance, "_previous_slug", None)
+    if previous_slug:
+        keys.add(post_key(previous_slug))
+    _purge_on_commit(*keys)
+
+
+@receiver(m2m_changed, sender=Posts.tags.through)
+def invalidate_post_tag_pages(instance, action, **_kwargs):
+    if action in ("post_add", "post_remove", "post_clear") and isinstance(
+        instance, Posts
+    ):
+        # Tags are saved after the post itself, so bump ``modified`` to roll
+        # over the (slug, modified) keyed detail fragments as well.
+        Posts.objects.filter(pk=instance.pk).update(modified=timezone.now())
+        _purge_on_commit(post_key(instance.slug))
+
+
+@receiver(post_save, sender=Resume)
+@receiver(post_delete, sender=Resume)
+@receiver(post_save, sender=WorkExperience)
+@receiver(post_delete, sender=WorkExperience)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Projects)
+@receiver(post_delete, sender=Projects)
+@receiver(post_save, sender=Certification)
+@receiver(post_delete, sender=Certification)
+def invalidate_resume_pages(**_kwargs):
+    _purge_on_commit(RESUME_KEY)
+    transaction.on_commit(resume_pdf_service.refresh)
@@ -1,10 +1,12 @@
 import logging
 
+import httpx
 import requests
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.core.files.storage import Storage
+from django.core.files.utils import validate_file_name
 
-from services.seaweedfs import SeaweedFSClient
+from services.seaweedfs import get_async_seaweedfs_client, get_seaweedfs_client
 
 logger = logging.getLogger(__name__)
 
@@ -27,25 +29,42 @@ class SeaweedStorage(Storage):
                 "SEAWEEDFS_URL and SEAWEEDFS_PREFIX are required in settings."
             )
 
-        self.client = SeaweedFSClient(self.base_url)
+        self.client = get_seaweedfs_client(self.base_url)
+        self.async_client = get_async_seaweedfs_client(self.base_url)
         logger.info(
             "SeaweedStorage initialized", extra={"base_url": base_url, "prefix": prefix}
         )
 
+    def stored_name(self, name):
+        """
+        Name under which _save() stores ``name``, i.e. what exists(), url()
+        and delete() expect.
+        """
+        return f"{self.prefix}/{name}"
+
+    def save_if_missing(self, name, content):
+        """
+        Save under a content-addressed name, reusing the stored object when
+        one already exists instead of uploading the same bytes again.
+        """
+        stored_name = self.stored_name(name)
+        if self.exists(stored_name):
+            logger.info("Reusing stored file", extra={"file_path": stored_name})
+            return stored_name
+        return self.save(name, content)
+
     def _save(self, name, content):
         """
         Save file to SeaweedFS.
         """
-        full_path = f"{self.prefix}/{name}"
+        full_path = self.stored_name(name)
 
         try:
-            file_size = (
-                content.size if hasattr(content, "size") else len(content.read())
-            )
-            content.seek(0)  # Reset file pointer after reading size
+            file_size = content.size
+            content.seek(0)
 
-            file_data = content.read()
-            self.client.upload_file(full_path, file_data)
+            # Streamed from the upload's memory buffer or temp file in blocks
+            self.client.upload_stream(full_path, content, file_size)
 
             logger.info(
                 "File saved to SeaweedFS",
@@ -101,17 +120,11 @@ class SeaweedStorage(Storage):
         Check if file exists via HEAD request.
         """
         try:
-            url = f"{self.base_url}/{name}"
-            response = requests.head(url, timeout=5)
-            exists = response.status_code == 200
+            exists = self.client.file_exists(name)
 
             logger.debug(
                 "File existence check",
-                extra={
-                    "file_path": name,
-                    "exists": exists,
-                    "status_code": response.status_code,
-                },
+                extra={"file_path": name, "exists": exists},
             )
             return exists
         except requests.RequestException as e:
@@ -126,3 +139,84 @@ class SeaweedStorage(Storage):
         Return public URL.
         """
         return self.client.get_file_url(name)
+
+    # Async API, for views running under config.asgi. Mirrors the sync methods
+    # above without blocking the event loop on filer I/O.
+
+    async def asave(self, name, content):
+        """
+        Async counterpart of Storage.save(). Upload names are already unique
+        (generated by the callers), so no availability lookup is done.
+        """
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        validate_file_name(name, allow_relative_path=True)
+        full_path = self.stored_name(name)
+
+        try:
+            file_size = content.size
+            content.seek(0)
+
+            # Streamed in blocks, like _save()
+            await self.async_client.upload_stream(full_path, content, file_size)
+            logger.info(
+                "File saved to SeaweedFS",
+                extra={
+                    "file_path": full_path,
+                    "file_name": name,
+                    "file_size": file_size,
+                },
+            )
+            return full_path
+        except Exception as e:
+            logger.exception(
+                "Failed to save file to SeaweedFS",
+                extra={"file_path": full_path, "file_name": name, "error": str(e)},
+            )
+            raise
+
+    async def aopen(self, name, _mode="rb"):
+        try:
+            file_bytes = await self.async_client.get_file(name)
+            logger.info(
+                "File retrieved from SeaweedFS",
+                extra={"file_path": name, "size": len(file_bytes)},
+            )
+            return ContentFile(file_bytes)
+        except Exception as e:
+            logger.exception(
+                "Failed to retrieve file from SeaweedFS",
+                extra={"file_path": name, "error": str(e)},
+            )
+            raise
+
+    async def adelete(self, name):
+        try:
+            await self.async_client.delete_file(name)
+            logger.info("File deleted from SeaweedFS", extra={"file_path": name})
+        except Exception as e:
+            logger.exception(
+                "Failed to delete file from SeaweedFS",
+                extra={"file_path": name, "error": str(e)},
+            )
+            raise
+
+    async def aexists(self, name):
+        try:
+            exists = await self.async_client.file_exists(name)
+            logger.debug(
+                "File existence check",
+                extra={"file_path": name, "exists": exists},
+            )
+            return exists
+        except httpx.HTTPError as e:
+            logger.warning(
+                "Failed to check file existence",
+                extra={"file_path": name, "error": str(e)},
+            )
+            return False
+
+    async def aurl(self, name):
+        return self.async_client.get_file_url(name)
@@ -0,0 +1,40 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+RENDITION_MIME_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+}
+
+
+@register.simple_tag
+def picture(image, alt="", css_class="", sizes="100vw", loading="lazy"):
+    """
+    Renders a <picture> with one srcset per rendition format of a WebPImageField.
+    Example: {% picture object.thumbnail alt=object.title css_class="w-full" %}
+    """
+    if not image:
+        return ""
+
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (
+                RENDITION_MIME_TYPES[rendition_format],
+                ", ".join(f"{url} {width}w" for url, width in urls),
+                sizes,
+            )
+            for rendition_format, urls in image.renditions.items()
+        ),
+    )
+    return format_html(
+        '<picture>{}<img class="{}" src="{}" alt="{}" loading="{}" decoding="async"></picture>',
+        sources,
+        css_class,
+        image.url,
+        alt,
+        loading,
+    )
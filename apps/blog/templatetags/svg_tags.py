@@ -3,11 +3,51 @@ import os
 
 from django import template
 from django.conf import settings
-from django.utils.safestring import mark_safe
+from django.utils.safestring import SafeString, mark_safe
 
 register = template.Library()
 logger = logging.getLogger(__name__)
 
+PRELOAD_DIRECTORY = "icons"
+
+# Process-wide caches, keyed on the file's mtime so edited icons are reread:
+# path -> (mtime, svg) and (path, class) -> (mtime, svg with the class injected)
+_svg_cache: dict[str, tuple[float, str]] = {}
+_rendered_cache: dict[tuple[str, str], tuple[float, SafeString]] = {}
+
+
+def _static_path(path: str) -> str:
+    return os.path.join(settings.BASE_DIR, "static", path)
+
+
+def _load_svg(path: str) -> tuple[float, str]:
+    full_path = _static_path(path)
+    mtime = os.stat(full_path).st_mtime
+    cached = _svg_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached
+
+    with open(full_path, "r") as svg_file:
+        cached = mtime, svg_file.read()
+    _svg_cache[path] = cached
+    return cached
+
+
+def preload_svgs():
+    """
+    Read every SVG under static/icons into the cache. Called from
+    BlogConfig.ready(), i.e. in the gunicorn master before it forks, so the
+    workers share these pages copy-on-write instead of each reading them.
+    """
+    directory = _static_path(PRELOAD_DIRECTORY)
+    if not os.path.isdir(directory):
+        return
+    for root, _dirs, files in os.walk(directory):
+        for file_name in files:
+            if file_name.endswith(".svg"):
+                full_path = os.path.join(root, file_name)
+                _load_svg(os.path.relpath(full_path, _static_path("")))
+
 
 @register.simple_tag
 def render_svg(path, tailwind_css_color=""):
@@ -15,18 +55,20 @@ def render_svg(path, tailwind_css_color=""):
     Renders an inline SVG file from the static directory with optional CSS color class.
     Example: {% render_svg "icons/anchor.svg" color="text-red-500" %}
     """
-    full_path = os.path.join(settings.BASE_DIR, "static", path)
     try:
-        with open(full_path, "r") as svg_file:
-            svg_content = svg_file.read()
+        mtime, svg_content = _load_svg(path)
+        rendered = _rendered_cache.get((path, tailwind_css_color))
+        if rendered is None or rendered[0] != mtime:
             if tailwind_css_color:
                 # Add class to <svg> tag
                 svg_content = svg_content.replace(
                     "<svg", f'<svg class="{tailwind_css_color}"', 1
                 )
-            return mark_safe(svg_content)
+            rendered = mtime, mark_safe(svg_content)
+            _rendered_cache[path, tailwind_css_color] = rendered
+        return rendered[1]
     except FileNotFoundError:
-        logger.warning(f"SVG not found: {full_path}")
+        logger.warning(f"SVG not found: {_static_path(path)}")
         return mark_safe(f"<!-- SVG not found: {path} -->")
     except Exception as e:
         logger.exception(f"Error rendering SVG '{path}': {e}")
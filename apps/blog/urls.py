@@ -1,8 +1,9 @@
+from django.conf import settings
 from django.urls import path
 
 from apps.blog.views import AboutView, HomeView
 from apps.blog.views.posts import PostDetailView, PostListView
-from apps.blog.views.projects import ProjectsTemplateView
+from apps.blog.views.projects import AsyncProjectsTemplateView, ProjectsTemplateView
 from apps.blog.views.resume import ResumeDownloadView, ResumePreviewView, ResumeView
 
 app_name = "blog"
@@ -11,8 +12,15 @@ urlpatterns = [
     path("", HomeView.as_view(), name="home"),
     path("about/", AboutView.as_view(), name="about"),
     path("posts/", PostListView.as_view(), name="posts"),
+    path("posts/year/<int:year>/", PostListView.as_view(), name="posts_year"),
     path("posts/<slug:slug>/", PostDetailView.as_view(), name="post_detail"),
-    path("projects/", ProjectsTemplateView.as_view(), name="projects"),
+    path(
+        "projects/",
+        AsyncProjectsTemplateView.as_view()
+        if settings.GITHUB_ASYNC_PROJECTS
+        else ProjectsTemplateView.as_view(),
+        name="projects",
+    ),
     path("resume/", ResumeView.as_view(), name="resume"),
     path("resume/preview/", ResumePreviewView.as_view(), name="resume_preview"),
     path("resume/download/", ResumeDownloadView.as_view(), name="resume_download"),
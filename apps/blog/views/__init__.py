@@ -1,13 +1,21 @@
 from apps.blog.views.about import AboutView
 from apps.blog.views.home import HomeView
 from apps.blog.views.posts import PostListView
-from apps.blog.views.serve_seaweedfs_file import serve_seaweedfs_file
-from apps.blog.views.tinymce_upload_image import tinymce_upload_image
+from apps.blog.views.serve_seaweedfs_file import (
+    serve_seaweedfs_file,
+    serve_seaweedfs_file_async,
+)
+from apps.blog.views.tinymce_upload_image import (
+    tinymce_upload_image,
+    tinymce_upload_status,
+)
 
 __all__ = [
     "AboutView",
     "HomeView",
     "PostListView",
     "serve_seaweedfs_file",
+    "serve_seaweedfs_file_async",
     "tinymce_upload_image",
+    "tinymce_upload_status",
 ]
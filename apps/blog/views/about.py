@@ -2,10 +2,56 @@ from django.http import Http404
 from django.views.generic import TemplateView
 
 from apps.blog.models import User
+from apps.blog.views.mixins import SurrogateKeyCacheMixin
+from services.redis import CACHE_PREFIXES, RedisCacheHandler
 from utilities.resolve_variables import VariableResolver
 
+ABOUT_CACHE_NAME = "about_html"
+ABOUT_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day, invalidated on User/Profile save
 
-class AboutView(TemplateView):
+_cache = RedisCacheHandler(CACHE_PREFIXES["CONTEXT"], ABOUT_CACHE_TIMEOUT)
+
+
+def _resolve_about() -> str:
+    user = User.objects.select_related("profile").first()
+    if user is None:
+        raise Http404("User not found")
+
+    user_dict = {
+        "username": user.username,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "profile": {
+            "bio": user.profile.bio,
+            "avatar": user.profile.avatar.url if user.profile.avatar else None,
+            "year_of_birth": user.profile.year_of_birth,
+            "github_link": user.profile.github_link,
+            "linkedin_link": user.profile.linkedin_link,
+        },
+    }
+    if not user.profile.about:
+        return ""
+    return VariableResolver(user.profile.about, user_dict).resolve()
+
+
+def get_resolved_about() -> str:
+    """
+    Profile.about with its {variable.*} placeholders resolved, cached until
+    the root user or profile changes.
+    """
+    about = _cache.get(ABOUT_CACHE_NAME)
+    if about is None:
+        about = _resolve_about()
+        _cache.set_cache(ABOUT_CACHE_NAME, about)
+    return about
+
+
+def invalidate_resolved_about():
+    _cache.delete(ABOUT_CACHE_NAME)
+
+
+class AboutView(SurrogateKeyCacheMixin, TemplateView):
     template_name = "blog/about.html"
 
     def get_context_data(self, **kwargs):
@@ -15,27 +61,6 @@ class AboutView(TemplateView):
         return kwargs
 
     def get(self, _request, *_args, **kwargs):
-        user = User.objects.select_related("profile").first()
-        if user is None:
-            raise Http404("User not found")
-
-        user_dict = {
-            "username": user.username,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "profile": {
-                "bio": user.profile.bio,
-                "avatar": user.profile.avatar.url if user.profile.avatar else None,
-                "year_of_birth": user.profile.year_of_birth,
-                "github_link": user.profile.github_link,
-                "linkedin_link": user.profile.linkedin_link,
-            },
-        }
-        variables = VariableResolver(user.profile.about, user_dict)
-        user.profile.about = variables.resolve()
-
         context = self.get_context_data(**kwargs)
-
-        context["user"] = user
+        context["about"] = get_resolved_about()
         return self.render_to_response(context)
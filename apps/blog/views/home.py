@@ -1,7 +1,9 @@
 from django.views.generic import TemplateView
 
+from apps.blog.views.mixins import SurrogateKeyCacheMixin
 
-class HomeView(TemplateView):
+
+class HomeView(SurrogateKeyCacheMixin, TemplateView):
     template_name = "blog/home.html"
 
     def render_to_response(self, context, **response_kwargs):
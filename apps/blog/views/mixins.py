@@ -0,0 +1,64 @@
+from asgiref.sync import sync_to_async
+
+from services import page_cache
+
+
+class SurrogateKeyCacheMixin:
+    """
+    Serve anonymous GET/HEAD requests from the surrogate-key page cache.
+
+    Every public page renders the shared() context, so it is always tagged
+    with the profile key on top of ``surrogate_keys``. Works for async views
+    too, dispatch() then returns a coroutine and Redis is only called from
+    a thread, off the event loop.
+    """
+
+    surrogate_keys: tuple[str, ...] = ()
+    page_cache_timeout: int | None = None  # Defaults to settings.PAGE_CACHE_TIMEOUT
+
+    def get_surrogate_keys(self) -> list[str]:
+        return [*self.surrogate_keys, page_cache.PROFILE_KEY]
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._adispatch(request, *args, **kwargs)
+        if not page_cache.is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        cached_response = page_cache.get_cached_page(request)
+        if cached_response is not None:
+            return cached_response
+
+        tokens = page_cache.surrogate_tokens(self.get_surrogate_keys())
+        response = super().dispatch(request, *args, **kwargs)
+        return self._store_when_rendered(request, response, tokens)
+
+    async def _adispatch(self, request, *args, **kwargs):
+        if not page_cache.is_cacheable_request(request):
+            return await super().dispatch(request, *args, **kwargs)
+
+        cached_response = await sync_to_async(page_cache.get_cached_page)(request)
+        if cached_response is not None:
+            return cached_response
+
+        tokens = await sync_to_async(page_cache.surrogate_tokens)(
+            self.get_surrogate_keys()
+        )
+        response = await super().dispatch(request, *args, **kwargs)
+        if getattr(response, "is_rendered", True):
+            await sync_to_async(self._store_page)(request, response, tokens)
+            return response
+        # The handler renders it, and runs the callback, in a thread
+        return self._store_when_rendered(request, response, tokens)
+
+    def _store_page(self, request, response, tokens):
+        page_cache.store_page(request, response, tokens, self.page_cache_timeout)
+
+    def _store_when_rendered(self, request, response, tokens):
+        if getattr(response, "is_rendered", True):
+            self._store_page(request, response, tokens)
+        else:
+            response.add_post_render_callback(
+                lambda rendered: self._store_page(request, rendered, tokens)
+            )
+        return response
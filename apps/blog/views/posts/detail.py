@@ -1,13 +1,53 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models import prefetch_related_objects
 from django.views.generic.detail import DetailView
 
 from apps.blog.models import Posts
+from apps.blog.views.mixins import SurrogateKeyCacheMixin
+from services.page_cache import post_key
 
+# {% cache %} fragment names used by blog/posts/detail.html
+BODY_FRAGMENT = "post_body"
+TOC_FRAGMENT = "post_toc"
 
-class PostDetailView(DetailView):
+
+class PostDetailView(SurrogateKeyCacheMixin, DetailView):
     model = Posts
     template_name = "blog/posts/detail.html"
 
+    # Rendered from the cached fragments, only loaded when one of them misses
+    fragment_fields = ("content", "table_of_contents")
+
+    def get_surrogate_keys(self):
+        return [post_key(self.kwargs["slug"]), *super().get_surrogate_keys()]
+
+    def get_queryset(self):
+        return super().get_queryset().defer(*self.fragment_fields)
+
+    @staticmethod
+    def get_fragment_vary_on(post) -> list:
+        # Must match the vary_on arguments of the {% cache %} tags in the template
+        return [post.slug, post.modified]
+
+    def fragments_cached(self) -> bool:
+        vary_on = self.get_fragment_vary_on(self.object)
+        keys = [
+            make_template_fragment_key(fragment, vary_on)
+            for fragment in (BODY_FRAGMENT, TOC_FRAGMENT)
+        ]
+        return len(cache.get_many(keys)) == len(keys)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["fragment_cache_timeout"] = settings.POST_FRAGMENT_CACHE_TIMEOUT
+        return context
+
     def get(self, _request, *_args, **_kwargs):
         self.object = self.get_object()
+        if not self.fragments_cached():
+            self.object.refresh_from_db(fields=self.fragment_fields)
+            prefetch_related_objects([self.object], "tags")
         context = self.get_context_data(object=self.object)
         return self.render_to_response(context)
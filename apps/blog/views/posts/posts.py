@@ -1,41 +1,78 @@
-from collections import defaultdict
-
 from django.db.models import Count
+from django.http import Http404
 from django.views.generic import ListView
 
 from apps.blog.models import Posts
+from apps.blog.views.mixins import SurrogateKeyCacheMixin
+from services.page_cache import POSTS_LIST_KEY
 
 
-class PostListView(ListView):
+class PostListView(SurrogateKeyCacheMixin, ListView):
     model: Posts = Posts
     template_name = "blog/posts/index.html"
     context_object_name = "posts"
+    surrogate_keys = (POSTS_LIST_KEY,)
+
+    # Only the columns the list renders, never the content/TOC HTML fields
+    list_fields = ("title", "slug", "year", "created")
+
+    def get_year(self) -> int | None:
+        """
+        Year filter from /posts/year/<year>/ or /posts/?year=<year>.
+        """
+        year = self.kwargs.get("year", self.request.GET.get("year"))
+        if year in (None, ""):
+            return None
+        try:
+            return int(year)
+        except (TypeError, ValueError) as error:
+            raise Http404("Invalid year") from error
 
     def get_queryset(self):
-        year = (
+        self.year = self.get_year()
+        posts = self.model.published.values(*self.list_fields).order_by(
+            "-year", "-created"
+        )
+        if self.year is not None:
+            posts = posts.filter(year=self.year)
+
+        # Group and count in the same pass over the rows
+        grouped = {}
+        for post in posts:
+            grouped.setdefault(post["year"], []).append(post)
+
+        if self.year is not None and not grouped:
+            raise Http404("No posts for this year")
+
+        return [
+            {
+                "year": year_value,
+                "year_count": len(blog_posts),
+                "blog_post": blog_posts,
+            }
+            for year_value, blog_posts in grouped.items()
+        ]
+
+    def get_years(self, queryset):
+        """
+        Year navigation: free on the full list, one aggregate on a year page.
+        """
+        if self.year is None:
+            return [
+                {"year": group["year"], "year_count": group["year_count"]}
+                for group in queryset
+            ]
+        return list(
             self.model.published.values("year")
             .annotate(year_count=Count("id"))
             .order_by("-year")
         )
-        posts = self.model.published.order_by("-year", "-created")
 
-        default = defaultdict(list)
-        for post in posts:
-            default[post.year].append(post)
-
-        queryset = []
-        for year_item in year:
-            year_value = year_item["year"]
-            year_count = year_item["year_count"]
-            queryset.append(
-                {
-                    "year": year_value,
-                    "year_count": year_count,
-                    "blog_post": default[year_value],
-                }
-            )
-
-        return queryset
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["years"] = self.get_years(self.object_list)
+        context["selected_year"] = self.year
+        return context
 
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
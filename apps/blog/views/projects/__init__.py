@@ -1,3 +1,6 @@
-from apps.blog.views.projects.projects import ProjectsTemplateView
+from apps.blog.views.projects.projects import (
+    AsyncProjectsTemplateView,
+    ProjectsTemplateView,
+)
 
-__all__ = ["ProjectsTemplateView"]
+__all__ = ["AsyncProjectsTemplateView", "ProjectsTemplateView"]
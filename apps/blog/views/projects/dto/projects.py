@@ -1,13 +1,13 @@
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, cast
+from datetime import UTC, datetime
+from typing import Any, ClassVar, cast
 
 from django.utils.dateparse import parse_datetime
 
 from utilities.base_dto import BaseDto
 
 
-@dataclass
+@dataclass(slots=True)
 class GithubProjectDto(BaseDto):
     id: int
     name: str
@@ -18,6 +18,9 @@ class GithubProjectDto(BaseDto):
     created_at: datetime
     description: str | None = None
 
+    # Bumped whenever the fields or their order change, see to_record()
+    RECORD_VERSION: ClassVar[int] = 1
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "GithubProjectDto":
         """Create DTO from GitHub API response, ignoring extra fields."""
@@ -44,3 +47,30 @@ class GithubProjectDto(BaseDto):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "description": self.description,
         }
+
+    @classmethod
+    def from_record(cls, record: list[Any]) -> "GithubProjectDto":
+        """Create DTO from a to_record() list, already normalized."""
+        created_at = record[6]
+        return cls(
+            *record[:6],
+            datetime.fromtimestamp(created_at, UTC) if created_at is not None else None,
+            record[7],
+        )
+
+    def to_record(self) -> list[Any]:
+        """
+        Convert DTO to a compact list for caching: fields in declaration
+        order, created_at as a Unix timestamp. No keys are repeated per
+        project and nothing needs parsing when read back.
+        """
+        return [
+            self.id,
+            self.name,
+            self.html_url,
+            self.stargazers_count,
+            self.forks,
+            self.topics,
+            int(self.created_at.timestamp()) if self.created_at else None,
+            self.description,
+        ]
@@ -1,13 +1,47 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.views.generic import TemplateView
 
-from apps.blog.views.projects.services import ProjectsService
+from apps.blog.views.mixins import SurrogateKeyCacheMixin
+from apps.blog.views.projects.services import AsyncProjectsService, ProjectsService
+from services.page_cache import PROJECTS_KEY
 
 
-class ProjectsTemplateView(TemplateView):
+class ProjectsTemplateView(SurrogateKeyCacheMixin, TemplateView):
     template_name = "blog/projects/index.html"
     projects = ProjectsService()
+    surrogate_keys = (PROJECTS_KEY,)
+    # GitHub data has no save signal, expire with the projects cache instead
+    page_cache_timeout = ProjectsService.CACHE_TIMEOUT
 
     def render_to_response(self, context, **response_kwargs):
         projects = self.projects.get_projects()
-        context["projects"] = projects
-        return super().render_to_response(context, **response_kwargs)
+        return self.render_projects(context, projects, **response_kwargs)
+
+    def render_projects(self, context, projects, **response_kwargs):
+        context["projects"] = projects or []
+        context["projects_loading"] = projects is None
+        response = super().render_to_response(context, **response_kwargs)
+        if projects is None:
+            # Not fetched yet: keep this page out of the page and browser caches
+            response["Cache-Control"] = "no-store"
+        return response
+
+
+class AsyncProjectsTemplateView(ProjectsTemplateView):
+    """
+    ProjectsTemplateView for config.asgi: GitHub is awaited on the event loop
+    instead of blocking a worker.
+    """
+
+    projects = AsyncProjectsService()
+
+    async def get(self, request, *_args, **kwargs):
+        context = self.get_context_data(**kwargs)
+        if isinstance(request, ASGIRequest):
+            projects = await self.projects.aget_projects()
+        else:
+            # Under WSGI the event loop only lasts for this request, and would
+            # drop the refresh task: refresh on the thread executor instead.
+            projects = await sync_to_async(self.projects.get_projects)()
+        return self.render_projects(context, projects)
@@ -1,46 +1,203 @@
+import asyncio
 import logging
+import time
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from asgiref.sync import sync_to_async
 
 from apps.blog.views.projects.dto.projects import GithubProjectDto
-from services.github import github_service
+from services.background import BackgroundExecutor
+from services.github import async_github_service, github_service
 from services.github.github import RepositoriesParams
+from services.page_cache import PROJECTS_KEY, purge_surrogate_keys
 from services.redis import CACHE_PREFIXES, RedisCacheHandler
 
 logger = logging.getLogger(__name__)
 
+_refresh_executor = BackgroundExecutor("github-projects", max_workers=1)
+
 
 class GithubProjectsFetchError(Exception):
     """Raised when fetching GitHub projects fails."""
 
 
 class ProjectsService:
-    CACHE_NAME = "github_repositories"
-    CACHE_TIMEOUT = 60 * 60  # 1 hour
+    """
+    GitHub projects, served stale-while-revalidate.
+
+    They are cached as GithubProjectDto records (see to_record()), so a hit
+    is one JSON decode and positional DTO construction, with no per-field
+    parsing. Entries of another RECORD_VERSION are treated as missing.
+
+    Requests always get the last good copy from Redis. Once it is older than
+    CACHE_TIMEOUT, a background refresh is started by whichever worker first
+    takes the refresh lock. The copy itself lives for FALLBACK_TIMEOUT, so
+    GitHub being down only makes it older. Only a cold cache waits on GitHub,
+    for at most COLD_WAIT seconds.
+    """
+
+    CACHE_NAME = "github_projects"
+    CACHE_TIMEOUT = 60 * 60  # 1 hour, then refreshed in the background
+    FALLBACK_TIMEOUT = 60 * 60 * 24 * 7  # 1 week
+    LOCK_NAME = "github_projects_refresh_lock"
+    # Outlives a refresh (GitHub read timeout is 30s)
+    LOCK_TIMEOUT = 60
+    # A failed refresh keeps the lock this long, so requests don't retry it
+    FAILURE_BACKOFF = 60 * 5  # 5 minutes
+    COLD_WAIT = 3  # seconds
 
     def __init__(self):
         self.cache = RedisCacheHandler(CACHE_PREFIXES["PROJECTS"], self.CACHE_TIMEOUT)
 
-    def get_projects(self) -> list[GithubProjectDto]:
-        cached_projects, is_cached = self._get_cached_github_project()
-        if is_cached:
-            return [GithubProjectDto.from_dict(project) for project in cached_projects]
+    @staticmethod
+    def _repositories_params() -> RepositoriesParams:
+        return RepositoriesParams(
+            type="owner", sort="created", direction="desc", per_page=100
+        )
+
+    @staticmethod
+    def _to_dtos(projects: list[list]) -> list[GithubProjectDto]:
+        return [GithubProjectDto.from_record(project) for project in projects]
+
+    def _read_entry(self) -> tuple[dict | None, bool]:
+        """
+        The cached entry, and whether it is due for a refresh.
+        """
+        entry = self.cache.get(name=self.CACHE_NAME)
+        if entry is None or entry.get("version") != GithubProjectDto.RECORD_VERSION:
+            return None, False
+        return entry, time.time() - entry["fetched_at"] > self.CACHE_TIMEOUT
+
+    def _cached_entry(self) -> dict | None:
+        entry, stale = self._read_entry()
+        if stale:
+            self.schedule_refresh()
+        return entry
+
+    def _acquire_refresh_lock(self) -> str | None:
+        token = uuid.uuid4().hex
+        if not self.cache.add(self.LOCK_NAME, token, self.LOCK_TIMEOUT):
+            return None
+        return token
+
+    def get_projects(self) -> list[GithubProjectDto] | None:
+        """
+        The projects, or None when none were fetched yet and GitHub didn't
+        answer within COLD_WAIT.
+        """
+        entry = self._cached_entry()
+        if entry is not None:
+            return self._to_dtos(entry["projects"])
+
+        future = self.schedule_refresh()
+        if future is None:
+            # Another worker is fetching them
+            return None
+        try:
+            projects = future.result(timeout=self.COLD_WAIT)
+        except FutureTimeoutError:
+            return None
+        return self._to_dtos(projects) if projects is not None else None
+
+    def schedule_refresh(self):
+        """
+        Start a background refresh, unless one is already running in any
+        worker or the last one failed less than FAILURE_BACKOFF ago.
+        """
+        token = self._acquire_refresh_lock()
+        if token is None:
+            return None
+        return _refresh_executor.submit(self.refresh, token)
 
+    def refresh(self, lock_token: str) -> list[list] | None:
         try:
-            params = RepositoriesParams(type="owner", sort="created", direction="desc")
-            response = github_service.get_user_repositories(params=params)
-            datas = [GithubProjectDto.from_dict(project) for project in response]
-            self._set_cached_github_project([project.to_dict() for project in datas])
-            return datas
+            response = github_service.get_user_repositories(
+                params=self._repositories_params()
+            )
         except Exception as error:
-            logger.exception("Failed to fetch GitHub projects: %s", error)
-            return []
+            self._refresh_failed(lock_token, error)
+            return None
+        return self._store_projects(lock_token, response)
 
-    def _get_cached_github_project(self):
-        cached_projects = self.cache.get(name=self.CACHE_NAME)
+    def _refresh_failed(self, lock_token: str, error: Exception):
+        logger.exception("Failed to fetch GitHub projects: %s", error)
+        if self.cache.get(self.LOCK_NAME) == lock_token:
+            self.cache.set_cache(self.LOCK_NAME, lock_token, self.FAILURE_BACKOFF)
 
-        if not cached_projects:
-            return None, False
+    def _store_projects(self, lock_token: str, response: list[dict]) -> list[list]:
+        projects = [
+            GithubProjectDto.from_dict(project).to_record() for project in response
+        ]
+        previous = self.cache.get(name=self.CACHE_NAME)
+        self.cache.set_cache(
+            name=self.CACHE_NAME,
+            value={
+                "version": GithubProjectDto.RECORD_VERSION,
+                "projects": projects,
+                "fetched_at": time.time(),
+            },
+            timeout=self.FALLBACK_TIMEOUT,
+        )
+        if self.cache.get(self.LOCK_NAME) == lock_token:
+            self.cache.delete(self.LOCK_NAME)
+        # Cached /projects/ pages only need re-rendering when something changed
+        if previous is None or previous.get("projects") != projects:
+            purge_surrogate_keys(PROJECTS_KEY)
+        return projects
+
+
+class AsyncProjectsService(ProjectsService):
+    """
+    ProjectsService for async views: refreshes run as tasks on the event loop
+    through the async GitHub client, sharing the cache and lock with the
+    sync service. Redis is only called from a thread, off the event loop.
+
+    The tasks need an event loop that outlives the request, i.e. ASGI. Under
+    WSGI, use the inherited get_projects() from a thread instead.
+    """
 
-        return cached_projects, True
+    # Strong references, the event loop only keeps weak ones to its tasks
+    _tasks: set[asyncio.Task] = set()
 
-    def _set_cached_github_project(self, projects: list[GithubProjectDto]):
-        self.cache.set_cache(name=self.CACHE_NAME, value=projects)
+    async def aget_projects(self) -> list[GithubProjectDto] | None:
+        """
+        See ProjectsService.get_projects().
+        """
+        entry, stale = await sync_to_async(self._read_entry)()
+        if stale:
+            await self.aschedule_refresh()
+        if entry is not None:
+            return self._to_dtos(entry["projects"])
+
+        task = await self.aschedule_refresh()
+        if task is None:
+            # Another worker is fetching them
+            return None
+        try:
+            projects = await asyncio.wait_for(asyncio.shield(task), self.COLD_WAIT)
+        except TimeoutError:
+            return None
+        return self._to_dtos(projects) if projects is not None else None
+
+    async def aschedule_refresh(self) -> asyncio.Task | None:
+        """
+        See ProjectsService.schedule_refresh(), run as an event loop task.
+        """
+        token = await sync_to_async(self._acquire_refresh_lock)()
+        if token is None:
+            return None
+        task = asyncio.create_task(self.arefresh(token))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def arefresh(self, lock_token: str) -> list[list] | None:
+        try:
+            response = await async_github_service.get_user_repositories(
+                params=self._repositories_params()
+            )
+        except Exception as error:
+            await sync_to_async(self._refresh_failed)(lock_token, error)
+            return None
+        return await sync_to_async(self._store_projects)(lock_token, response)
@@ -3,30 +3,34 @@ from django.views.generic.base import TemplateView
 from apps.blog.models import Resume
 
 
+def get_resume_context() -> dict:
+    """
+    Template context for blog/resume/preview.html, shared by the preview page
+    and the PDF renders.
+    """
+    resume = Resume.objects.prefetch_related(
+        "experiences", "education", "projects", "certifications"
+    ).first()
+    if not resume:
+        return {}
+
+    return {
+        "resume": resume,
+        # Work Experiences
+        "experiences": resume.experiences.all(),
+        # Education
+        "educations": resume.education.all(),
+        # Projects
+        "projects": resume.projects.all(),
+        # Certifications
+        "certifications": resume.certifications.all(),
+    }
+
+
 class ResumePreviewBaseView(TemplateView):
     template_name = "blog/resume/preview.html"
 
-    def get_resume_data(self):
-        return Resume.objects.prefetch_related(
-            "experiences", "education", "projects", "certifications"
-        ).first()
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        resume = self.get_resume_data()
-        if resume:
-            context["resume"] = resume
-
-            # Work Experiences
-            context["experiences"] = resume.experiences.all()
-
-            # Education
-            context["educations"] = resume.education.all()
-
-            # Projects
-            context["projects"] = resume.projects.all()
-
-            # Certifications
-            context["certifications"] = resume.certifications.all()
-
+        context.update(get_resume_context())
         return context
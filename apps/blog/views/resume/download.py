@@ -1,37 +1,61 @@
+from django.conf import settings
 from django.http import HttpResponse
 from django.template.loader import render_to_string
-
-from apps.blog.context.global_context import shared
-from apps.blog.views.resume.base import ResumePreviewBaseView
-
-
-class ResumeDownloadView(ResumePreviewBaseView):
-    template_name = "blog/resume/preview.html"
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context.update(shared(self.request))
-        return context
+from django.utils.cache import get_conditional_response
+from django.views.generic.base import View
+
+from apps.blog.views.resume.services import (
+    ResumePdfPendingError,
+    resume_pdf_service,
+)
+
+
+class ResumeDownloadView(View):
+    filename = "nguyen_tran_quang_trung.pdf"
+    pending_template_name = "blog/resume/pdf_pending.html"
+    retry_after = 3  # seconds
+
+    def render_pending(self, request):
+        """
+        The PDF is rendering in the pool: answer right away instead of holding
+        this worker, the page reloads itself until the download is ready.
+        """
+        content = render_to_string(
+            self.pending_template_name,
+            {"retry_after": self.retry_after},
+            request=request,
+        )
+        response = HttpResponse(content, status=202)
+        response["Retry-After"] = str(self.retry_after)
+        response["Cache-Control"] = "no-store"
+        return response
 
     def get(self, request, *_args, **_kwargs):
-        # WeasyPrint is only used in PDF generation and requires heavy system dependencies
-        # (Cairo, Pango, etc.) that are not installed in local dev environments.
-        # To avoid breaking commands like `makemigrations` locally, we import it lazily
-        # inside the function where it's needed. This ensures Docker/prod environments
-        # still have full PDF functionality without forcing all developers to install
-        # the extra dependencies locally.
-        from weasyprint import HTML
-
-        html_string = render_to_string(
-            self.template_name, context=self.get_context_data()
+        try:
+            digest = resume_pdf_service.get_current_digest(
+                base_url=request.build_absolute_uri("/"),
+                wait=settings.RESUME_PDF_WAIT,
+            )
+        except ResumePdfPendingError:
+            return self.render_pending(request)
+
+        response = HttpResponse(content_type="application/pdf")
+        response["ETag"] = f'"{digest}"'
+        # Same URL, new bytes after every resume edit: always revalidate
+        response["Cache-Control"] = "no-cache"
+        response["Content-Disposition"] = f'inline; filename="{self.filename}"'
+
+        conditional_response = get_conditional_response(
+            request, etag=response["ETag"], response=response
         )
+        if conditional_response is not response:
+            return conditional_response
 
-        pdf_file = HTML(
-            string=html_string, base_url=request.build_absolute_uri()
-        ).write_pdf()
+        pdf_file = resume_pdf_service.get_pdf(digest)
+        if pdf_file is None:
+            # Artifact removed behind our back: render it again
+            resume_pdf_service.invalidate()
+            return self.render_pending(request)
 
-        response = HttpResponse(pdf_file, content_type="application/pdf")
-        response["Content-Disposition"] = (
-            'inline; filename="nguyen_tran_quang_trung.pdf"'
-        )
+        response.content = pdf_file
         return response
@@ -5,7 +5,9 @@ from django.views.decorators.clickjacking import (
     xframe_options_sameorigin,
 )
 
+from apps.blog.views.mixins import SurrogateKeyCacheMixin
 from apps.blog.views.resume.base import ResumePreviewBaseView
+from services.page_cache import RESUME_KEY
 
 
 def get_xframe_decorator():
@@ -20,5 +22,5 @@ def get_xframe_decorator():
 
 
 @method_decorator(get_xframe_decorator(), name="dispatch")
-class ResumePreviewView(ResumePreviewBaseView):
-    pass
+class ResumePreviewView(SurrogateKeyCacheMixin, ResumePreviewBaseView):
+    surrogate_keys = (RESUME_KEY,)
@@ -1,5 +1,7 @@
 from django.views.generic import TemplateView
 
+from apps.blog.views.mixins import SurrogateKeyCacheMixin
 
-class ResumeView(TemplateView):
+
+class ResumeView(SurrogateKeyCacheMixin, TemplateView):
     template_name = "blog/resume/index.html"
@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import time
+from concurrent.futures import Future
+
+import requests
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from apps.blog.context.global_context import get_root_user_snapshot
+from apps.blog.views.resume.base import get_resume_context
+from services.background import BackgroundExecutor
+from services.process_pool import BoundedProcessPool, PoolFullError
+from services.redis import CACHE_PREFIXES, RedisCacheHandler
+from services.seaweedfs import get_seaweedfs_client
+from utilities.render_pdf import render_pdf
+
+logger = logging.getLogger(__name__)
+
+
+# One shared pool for every web worker: renders are admitted globally through
+# Redis slots, so a burst of clicks can't occupy more than max_jobs renders.
+render_pool = BoundedProcessPool(
+    "resume_pdf",
+    max_workers=1,
+    max_jobs=settings.RESUME_PDF_RENDER_MAX_JOBS,
+    timeout=settings.RESUME_PDF_RENDER_TIMEOUT,
+    max_tasks_per_child=settings.RESUME_PDF_RENDER_MAX_TASKS_PER_CHILD,
+)
+
+# Done callbacks run on the pool's manager thread, which must not block on
+# the SeaweedFS upload: rendered PDFs are stored from here instead.
+_store_executor = BackgroundExecutor("resume-pdf-store", max_workers=1)
+
+
+class ResumePdfPendingError(Exception):
+    """Raised when the current resume PDF is still being rendered."""
+
+
+class ResumePdfService:
+    """
+    Resume PDFs are stored in SeaweedFS as artifacts named after the SHA-256
+    of the rendered HTML, which covers the resume, its related rows, the root
+    user context and the template. Redis only remembers the current digest,
+    so downloads never render unless the resume changed.
+
+    Renders run in ``render_pool``, never in the web worker, and at most one
+    render per digest is in flight across all workers.
+    """
+
+    CACHE_NAME = "current_pdf_digest"
+    CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 1 week, dropped on resume/profile save
+    TEMPLATE_NAME = "blog/resume/preview.html"
+    STORAGE_DIR = "resume/pdf"
+    RENDER_LOCK_NAME = "render_lock:{digest}"
+    POLL_INTERVAL = 0.25  # seconds
+
+    def __init__(self):
+        self.cache = RedisCacheHandler(CACHE_PREFIXES["RESUME"], self.CACHE_TIMEOUT)
+
+    @property
+    def client(self):
+        return get_seaweedfs_client(settings.SEAWEEDFS_URL)
+
+    def _file_path(self, digest: str) -> str:
+        return f"{settings.SEAWEEDFS_PREFIX}/{self.STORAGE_DIR}/{digest}.pdf"
+
+    def render_html(self) -> str:
+        context = get_resume_context()
+        context.update(get_root_user_snapshot())
+        return render_to_string(self.TEMPLATE_NAME, context=context)
+
+    def _render_html_digest(self) -> tuple[str, str]:
+        html_string = self.render_html()
+        return html_string, hashlib.sha256(html_string.encode()).hexdigest()
+
+    def get_current_digest(self, base_url: str | None = None, wait: float = 0) -> str:
+        """
+        Digest of the stored PDF matching the current resume. When it doesn't
+        exist yet a render is scheduled and this waits up to ``wait`` seconds
+        for it before raising ResumePdfPendingError.
+        """
+        digest = self.cache.get(self.CACHE_NAME)
+        if digest is not None:
+            return digest
+
+        html_string, digest = self._render_html_digest()
+        if self.client.file_exists(self._file_path(digest)):
+            self.cache.set_cache(self.CACHE_NAME, digest)
+            return digest
+
+        self.schedule_render(html_string, digest, base_url)
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            current_digest = self.cache.get(self.CACHE_NAME)
+            if current_digest is not None:
+                return current_digest
+        raise ResumePdfPendingError(digest)
+
+    def schedule_render(
+        self, html_string: str, digest: str, base_url: str | None = None
+    ) -> bool:
+        """
+        Start rendering ``digest`` unless another request already is.
+        Returns whether a render was submitted by this call.
+        """
+        lock_name = self.RENDER_LOCK_NAME.format(digest=digest)
+        # Held until the render is stored; expires if this worker dies first
+        if not self.cache.add(lock_name, True, render_pool.timeout + 30):
+            return False
+
+        try:
+            future = render_pool.submit(
+                render_pdf, html_string, base_url or settings.RESUME_PDF_BASE_URL
+            )
+        except PoolFullError:
+            self.cache.delete(lock_name)
+            logger.warning("Resume PDF render rejected, pool is full")
+            return False
+        except Exception:
+            self.cache.delete(lock_name)
+            raise
+
+        future.add_done_callback(
+            lambda done: _store_executor.submit(
+                self._store_render, done, digest, lock_name
+            )
+        )
+        logger.info("Scheduled resume PDF render", extra={"digest": digest})
+        return True
+
+    def _store_render(self, future: Future, digest: str, lock_name: str):
+        try:
+            self.client.upload_file(self._file_path(digest), future.result())
+            self.cache.set_cache(self.CACHE_NAME, digest)
+        except Exception:
+            logger.exception("Failed to render resume PDF", extra={"digest": digest})
+        finally:
+            self.cache.delete(lock_name)
+
+    def get_pdf(self, digest: str) -> bytes | None:
+        try:
+            return self.client.get_file(self._file_path(digest))
+        except requests.HTTPError:
+            logger.warning("Resume PDF artifact missing", extra={"digest": digest})
+            return None
+
+    def invalidate(self):
+        self.cache.delete(self.CACHE_NAME)
+
+    def refresh(self):
+        """
+        Drop the current digest and schedule a render in the background, so
+        the next download after an admin save is already a cheap byte-serve.
+        """
+        self.invalidate()
+        if not settings.RESUME_PDF_PRERENDER:
+            return
+        try:
+            html_string, digest = self._render_html_digest()
+            if self.client.file_exists(self._file_path(digest)):
+                self.cache.set_cache(self.CACHE_NAME, digest)
+            else:
+                self.schedule_render(html_string, digest)
+        except Exception:
+            logger.exception("Failed to schedule resume PDF render")
+
+
+resume_pdf_service = ResumePdfService()
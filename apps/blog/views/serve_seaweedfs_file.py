@@ -1,17 +1,124 @@
-import requests
 from django.conf import settings
-from django.http import Http404, HttpResponse
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
 
+from services.seaweedfs import get_async_seaweedfs_client, get_seaweedfs_client
 
-def serve_seaweedfs_file(_request, path):
-    # Construct SeaweedFS filer URL
-    filer_url = (
-        f"{settings.SEAWEEDFS_URL}/{settings.SEAWEEDFS_PREFIX}/{path.rstrip('/')}"
-    )
-    resp = requests.get(filer_url, stream=True)
+STREAM_CHUNK_SIZE = 64 * 1024  # 64 KB
+
+# Request headers forwarded to the filer so it can answer partial requests itself
+FORWARDED_REQUEST_HEADERS = ("Range", "If-Range")
+
+# Response headers copied from the filer to the client
+PASSTHROUGH_RESPONSE_HEADERS = (
+    "Accept-Ranges",
+    "Cache-Control",
+    "Content-Length",
+    "Content-Range",
+    "ETag",
+    "Last-Modified",
+)
+
+
+def _iter_upstream(resp):
+    """
+    Yield the filer body chunk by chunk, releasing the connection once the
+    client is done (or has disconnected).
+    """
+    try:
+        yield from resp.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    finally:
+        resp.close()
 
-    if resp.status_code != 200:
+
+def _upstream_request(request, path):
+    """
+    Return (file_path, method, headers) for the filer request proxying this one.
+    """
+    # Construct SeaweedFS filer path
+    file_path = f"{settings.SEAWEEDFS_PREFIX}/{path.rstrip('/')}"
+    method = "HEAD" if request.method == "HEAD" else "GET"
+    headers = {
+        header: request.headers[header]
+        for header in FORWARDED_REQUEST_HEADERS
+        if header in request.headers
+    }
+    return file_path, method, headers
+
+
+def _proxy_response(request, status_code, upstream_headers, streaming_content):
+    """
+    Build the client response for a filer answer whose body hasn't been read.
+    Returns (response, streams_body); when the body isn't relayed (416, 304,
+    412) the caller must close the upstream response.
+    """
+    if status_code == 416:
+        response = HttpResponse(status=416)
+        if "Content-Range" in upstream_headers:
+            response["Content-Range"] = upstream_headers["Content-Range"]
+        return response, False
+
+    if status_code not in (200, 206):
         raise Http404("File not found in SeaweedFS")
 
-    content_type = resp.headers.get("Content-Type", "application/octet-stream")
-    return HttpResponse(resp.content, content_type=content_type)
+    content_type = upstream_headers.get("Content-Type", "application/octet-stream")
+    response = StreamingHttpResponse(
+        streaming_content, status=status_code, content_type=content_type
+    )
+    for header in PASSTHROUGH_RESPONSE_HEADERS:
+        if header in upstream_headers:
+            response[header] = upstream_headers[header]
+
+    # Answer If-None-Match / If-Modified-Since from the filer's validators
+    # without reading a single byte of the body.
+    conditional_response = get_conditional_response(
+        request,
+        etag=upstream_headers.get("ETag"),
+        last_modified=parse_http_date_safe(upstream_headers.get("Last-Modified", "")),
+        response=response,
+    )
+    return conditional_response, conditional_response is response
+
+
+def serve_seaweedfs_file(request, path):
+    file_path, method, headers = _upstream_request(request, path)
+    resp = get_seaweedfs_client(settings.SEAWEEDFS_URL).open_stream(
+        file_path, headers=headers, method=method
+    )
+
+    try:
+        response, streams_body = _proxy_response(
+            request, resp.status_code, resp.headers, _iter_upstream(resp)
+        )
+    except Http404:
+        resp.close()
+        raise
+    if not streams_body:
+        resp.close()
+    return response
+
+
+async def serve_seaweedfs_file_async(request, path):
+    """
+    Async variant of serve_seaweedfs_file for config.asgi: the body is relayed
+    from the event loop, so one worker can serve many downloads concurrently.
+    """
+    file_path, method, headers = _upstream_request(request, path)
+    resp = await get_async_seaweedfs_client(settings.SEAWEEDFS_URL).open_stream(
+        file_path, headers=headers, method=method
+    )
+
+    try:
+        response, streams_body = _proxy_response(
+            request,
+            resp.status_code,
+            resp.headers,
+            resp.aiter_bytes(STREAM_CHUNK_SIZE),
+        )
+    except Http404:
+        await resp.aclose()
+        raise
+    if not streams_body:
+        await resp.aclose()
+    return response
@@ -1,14 +1,16 @@
+import mimetypes
 import os
-import uuid
 
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.http import JsonResponse
 from django.utils.text import get_valid_filename
+from django.views.decorators.http import require_GET
 
-from utilities.convert_image_to_webp import convert_image_to_webp
-from utilities.defused_svg import is_safe_svg
+from apps.blog.image_ingest import get_ingest_status, identify_image, ingest_image
+from utilities.content_hash import content_hash
+from utilities.defused_svg import is_safe_svg, sanitize_svg
 
 
 def tinymce_upload_image(request):
@@ -32,32 +34,45 @@ def tinymce_upload_image(request):
         ext = os.path.splitext(image.name)[1]
 
         if image.content_type == "image/svg+xml" or ext.lower() == ".svg":
-            svg_bytes = image.read()
-            is_safe, error_msg = is_safe_svg(svg_bytes)
-            if not is_safe:
-                return JsonResponse({"error": error_msg}, status=400)
-            unique_name = f"{uuid.uuid4()}{ext}"
+            if settings.SVG_UPLOAD_SANITIZE:
+                svg_bytes, _removed, error_msg = sanitize_svg(image)
+                if error_msg:
+                    return JsonResponse({"error": error_msg}, status=400)
+            else:
+                # Validated straight from the upload, stopping at the first
+                # violation without reading the rest
+                is_safe, error_msg = is_safe_svg(image)
+                if not is_safe:
+                    return JsonResponse({"error": error_msg}, status=400)
+                image.seek(0)
+                svg_bytes = image.read()
+            unique_name = f"{content_hash(svg_bytes)}{ext}"
             safe_name = get_valid_filename(unique_name)
-            path = default_storage.save(
+            path = default_storage.save_if_missing(
                 f"{settings.DEFAULT_UPLOAD_PREFIX}{safe_name}", ContentFile(svg_bytes)
             )
         else:
-            # Convert other images to WebP
+            # Store the original now, the WebP conversion runs in the background
+            # and the editor swaps the URL once tinymce_upload_status reports it.
             image_bytes = image.read()
-            webp_bytes, error_msg = convert_image_to_webp(
-                image_bytes, quality=85, max_width=2048, max_height=2048
-            )
-
+            error_msg = identify_image(image_bytes)
             if error_msg:
                 return JsonResponse(
                     {"error": f"Image conversion failed: {error_msg}"}, status=400
                 )
 
-            unique_name = f"{uuid.uuid4().hex}.webp"
-            safe_name = get_valid_filename(unique_name)
-            path = default_storage.save(
-                f"{settings.DEFAULT_UPLOAD_PREFIX}{safe_name}", ContentFile(webp_bytes)
+            status = ingest_image(
+                image_bytes, mimetypes.guess_extension(image.content_type)
             )
+            return JsonResponse(status)
 
         return JsonResponse({"location": f"/{path}"})
     return JsonResponse({"error": "Invalid request"}, status=400)
+
+
+@require_GET
+def tinymce_upload_status(request):
+    status = get_ingest_status(request.GET.get("location", ""))
+    if status is None:
+        return JsonResponse({"error": "Unknown upload"}, status=404)
+    return JsonResponse(status)
@@ -60,12 +60,74 @@ INSTALLED_APPS = [
 ]
 
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10 MB
+# Strip scripts, event handlers and dangerous URLs from uploaded SVGs instead
+# of rejecting them (utilities/defused_svg.py)
+SVG_UPLOAD_SANITIZE = env.bool("SVG_UPLOAD_SANITIZE", default=False)
 
 DEFAULT_UPLOAD_PREFIX = "uploads/"
 
+# Responsive renditions stored next to every WebPImageField upload, named
+# <base>-<width>w.<format> and rendered by the {% picture %} template tag.
+# Run `manage.py build_image_renditions` after changing them.
+IMAGE_RENDITION_WIDTHS = env.list(
+    "IMAGE_RENDITION_WIDTHS", cast=int, default=[320, 640, 1024, 2048]
+)
+IMAGE_RENDITION_FORMATS = env.list("IMAGE_RENDITION_FORMATS", default=["avif", "webp"])
+# Largest image, in pixels, decoded for a conversion (after JPEG scaled
+# decoding): 40 MP is ~120 MB as RGB. Larger uploads are rejected.
+IMAGE_MAX_DECODE_PIXELS = env.int("IMAGE_MAX_DECODE_PIXELS", default=40_000_000)
+
+# Opt-in cache of convert_image_to_webp results (services/image_conversion_cache.py):
+# "" (off), "disk" (LRU directory shared by the workers) or "redis".
+IMAGE_CONVERSION_CACHE = env.str("IMAGE_CONVERSION_CACHE", default="")
+IMAGE_CONVERSION_CACHE_DIR = env.str(
+    "IMAGE_CONVERSION_CACHE_DIR", default="/tmp/image-conversion-cache"
+)
+IMAGE_CONVERSION_CACHE_MAX_BYTES = env.int(
+    "IMAGE_CONVERSION_CACHE_MAX_BYTES", default=256 * 1024 * 1024
+)  # 256 MB
+IMAGE_CONVERSION_CACHE_MAX_ENTRY_BYTES = env.int(
+    "IMAGE_CONVERSION_CACHE_MAX_ENTRY_BYTES", default=5 * 1024 * 1024
+)  # 5 MB
+IMAGE_CONVERSION_CACHE_TIMEOUT = env.int(
+    "IMAGE_CONVERSION_CACHE_TIMEOUT", default=60 * 60 * 24 * 7
+)  # 1 week
+
+# Image transforms run in a bounded process pool (services/image_pool.py):
+# IMAGE_POOL_WORKERS processes per web worker, at most IMAGE_POOL_MAX_JOBS
+# jobs in flight across all of them. Jobs past the cap are rejected, except
+# background ones which retry for a slot.
+IMAGE_POOL_WORKERS = env.int("IMAGE_POOL_WORKERS", default=1)
+IMAGE_POOL_MAX_JOBS = env.int("IMAGE_POOL_MAX_JOBS", default=2)
+IMAGE_POOL_TIMEOUT = env.int("IMAGE_POOL_TIMEOUT", default=30)
+IMAGE_POOL_MAX_TASKS_PER_CHILD = env.int("IMAGE_POOL_MAX_TASKS_PER_CHILD", default=50)
+
+# Background threads per web worker converting editor uploads to WebP
+# (see apps/blog/image_ingest.py)
+IMAGE_INGEST_WORKERS = env.int("IMAGE_INGEST_WORKERS", default=2)
+# How long they keep retrying for a free image pool slot before giving up
+IMAGE_INGEST_SLOT_WAIT = env.int("IMAGE_INGEST_SLOT_WAIT", default=60 * 10)  # 10 min
+# How long an admin save waits for a free slot per image job. Both jobs of a
+# thumbnail save have to fit in gunicorn's 120s timeout, pool timeout included.
+IMAGE_ADMIN_SLOT_WAIT = env.int("IMAGE_ADMIN_SLOT_WAIT", default=20)
+
 SEAWEEDFS_URL = env.str("SEAWEEDFS_URL")
 SEAWEEDFS_PREFIX = "trungstacks-blog-media"
 
+# SeaweedFS client: timeouts (seconds), retries for idempotent calls and the size
+# of the per-process keep-alive pool. Sync gunicorn workers only hold one
+# connection at a time, the headroom is for background upload/conversion threads.
+SEAWEEDFS_CONNECT_TIMEOUT = env.float("SEAWEEDFS_CONNECT_TIMEOUT", default=3.05)
+SEAWEEDFS_READ_TIMEOUT = env.float("SEAWEEDFS_READ_TIMEOUT", default=30)
+SEAWEEDFS_MAX_RETRIES = env.int("SEAWEEDFS_MAX_RETRIES", default=3)
+SEAWEEDFS_RETRY_BACKOFF = env.float("SEAWEEDFS_RETRY_BACKOFF", default=0.3)
+SEAWEEDFS_POOL_MAXSIZE = env.int("SEAWEEDFS_POOL_MAXSIZE", default=10)
+# Uploads larger than this are split by the filer into chunks of this size
+SEAWEEDFS_CHUNK_SIZE_MB = env.int("SEAWEEDFS_CHUNK_SIZE_MB", default=4)
+
+# Serve media through the async streaming view (requires running config.asgi).
+SEAWEEDFS_ASYNC_MEDIA = env.bool("SEAWEEDFS_ASYNC_MEDIA", default=False)
+
 STORAGES = {
     "default": {
         "BACKEND": "apps.blog.storage.SeaweedStorage",
@@ -135,6 +197,37 @@ CACHES = {
     }
 }
 
+# Seconds each worker reuses its in-process copy of the root user context before
+# checking Redis again. Saves are invalidated in Redis immediately, so this is
+# the upper bound on how stale another worker's copy can be.
+SHARED_CONTEXT_LOCAL_TTL = env.int("SHARED_CONTEXT_LOCAL_TTL", default=10)
+
+# Surrogate-key page cache for the public views (see services/page_cache.py).
+# Entries are purged on save, the timeout only bounds how long unused pages live.
+PAGE_CACHE_ENABLED = env.bool("PAGE_CACHE_ENABLED", default=True)
+PAGE_CACHE_TIMEOUT = env.int("PAGE_CACHE_TIMEOUT", default=60 * 60 * 24)  # 1 day
+
+# Resume PDFs are rendered once per resume version and stored in SeaweedFS.
+# Renders triggered by an admin save have no request, so relative URLs in the
+# template (stylesheets) are resolved against this base URL instead.
+RESUME_PDF_BASE_URL = env.str("RESUME_PDF_BASE_URL", default="http://localhost:8000/")
+RESUME_PDF_PRERENDER = env.bool("RESUME_PDF_PRERENDER", default=True)
+# Renders run in a bounded process pool (services/process_pool.py) shared by
+# all web workers. A download waits RESUME_PDF_WAIT seconds for a cold render
+# before answering with a self-refreshing "please wait" page.
+RESUME_PDF_RENDER_MAX_JOBS = env.int("RESUME_PDF_RENDER_MAX_JOBS", default=2)
+RESUME_PDF_RENDER_TIMEOUT = env.int("RESUME_PDF_RENDER_TIMEOUT", default=60)
+RESUME_PDF_RENDER_MAX_TASKS_PER_CHILD = env.int(
+    "RESUME_PDF_RENDER_MAX_TASKS_PER_CHILD", default=20
+)
+RESUME_PDF_WAIT = env.float("RESUME_PDF_WAIT", default=3)
+
+# Rendered post body/TOC fragments are keyed on (slug, modified), so edits never
+# hit a stale entry; the timeout only bounds how long superseded ones linger.
+POST_FRAGMENT_CACHE_TIMEOUT = env.int(
+    "POST_FRAGMENT_CACHE_TIMEOUT", default=60 * 60 * 24 * 7
+)  # 1 week
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -263,3 +356,14 @@ CLIENT_GITHUB_BASE_URL = env.str(
     "CLIENT_GITHUB_BASE_URL", default="https://api.github.com"
 )
 CLIENT_GITHUB_API_VERSION = env.str("CLIENT_GITHUB_API_VERSION", default="2022-11-28")
+# Serve /projects/ through the async view, GitHub calls then wait on the event
+# loop instead of a worker. Only useful under config.asgi: under WSGI the view
+# refreshes on the thread executor, like the sync one.
+GITHUB_ASYNC_PROJECTS = env.bool("GITHUB_ASYNC_PROJECTS", default=False)
+# Threads fetching the pages of a paginated endpoint once the first page is in
+CLIENT_GITHUB_PAGE_WORKERS = env.int("CLIENT_GITHUB_PAGE_WORKERS", default=4)
+# Below this many requests left in the rate limit window, GitHubClient serves
+# cached responses instead of calling GitHub until the window resets
+CLIENT_GITHUB_RATE_LIMIT_RESERVE = env.int(
+    "CLIENT_GITHUB_RATE_LIMIT_RESERVE", default=50
+)
@@ -15,6 +15,11 @@ MIDDLEWARE += [
 
 DEBUG = True
 
+PAGE_CACHE_ENABLED = env.bool("PAGE_CACHE_ENABLED", default=False)
+
+# WeasyPrint's system libraries are usually missing outside Docker
+RESUME_PDF_PRERENDER = env.bool("RESUME_PDF_PRERENDER", default=False)
+
 ALLOWED_HOSTS = ALLOWED_HOSTS + env.list("DJANGO_ALLOWED_HOSTS", default=["localhost"])
 
 CSRF_TRUSTED_ORIGINS = env.list(
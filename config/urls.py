@@ -20,13 +20,23 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path, re_path
 
-from apps.blog.views import serve_seaweedfs_file, tinymce_upload_image
+from apps.blog.views import (
+    serve_seaweedfs_file,
+    serve_seaweedfs_file_async,
+    tinymce_upload_image,
+    tinymce_upload_status,
+)
 
 urlpatterns = [
     # Apps URLs
     path("", include(("apps.blog.urls", "blog"), namespace="blog")),
     # Admin URLs
     path("admin/tinymce-upload/", tinymce_upload_image, name="tinymce-upload"),
+    path(
+        "admin/tinymce-upload/status/",
+        tinymce_upload_status,
+        name="tinymce-upload-status",
+    ),
     path("admin/", admin.site.urls),
     # Third-party URLs
     path("tinymce/", include("tinymce.urls")),
@@ -37,13 +47,19 @@ if not settings.DEBUG:
         path("", include("django_prometheus.urls")),
     ]
 
-if settings.DEBUG:
+if settings.DEBUG or settings.SEAWEEDFS_ASYNC_MEDIA:
     urlpatterns += [
-        path("__reload__/", include("django_browser_reload.urls")),
         re_path(
             r"^trungstacks-blog-media/(?P<path>.*)$",
-            serve_seaweedfs_file,
+            serve_seaweedfs_file_async
+            if settings.SEAWEEDFS_ASYNC_MEDIA
+            else serve_seaweedfs_file,
             name="seaweedfs-serve",
         ),
+    ]
+
+if settings.DEBUG:
+    urlpatterns += [
+        path("__reload__/", include("django_browser_reload.urls")),
         *debug_toolbar_urls(),
     ]
@@ -0,0 +1,101 @@
+"""
+httpx based async HTTP client shared by the async service clients (SeaweedFS
+filer, GitHub API).
+
+Connection pools are bound to an event loop, so one httpx.AsyncClient is kept
+per running loop: under config.asgi there is a single one, while views run
+through async_to_sync get their own. Connection failures are retried by the
+transport, for any method since nothing was sent; 502/503/504 responses and
+read errors only for idempotent methods with a replayable body.
+"""
+
+import asyncio
+import weakref
+from collections.abc import AsyncIterable
+
+import httpx
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+class AsyncHTTPClient:
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout: tuple[float, float] = (5, 30),
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+        backoff_factor: float = 0,
+        headers: dict[str, str] | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        connect_timeout, read_timeout = timeout
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize
+        )
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.headers = dict(headers or {})
+
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=self.timeout,
+                transport=httpx.AsyncHTTPTransport(
+                    limits=self.limits, retries=self.max_retries
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict | None = None,
+        headers: dict[str, str] | None = None,
+        content: bytes | AsyncIterable[bytes] | None = None,
+    ) -> httpx.Response:
+        """
+        Send a request and return the response as soon as its headers are in.
+        The caller owns the response: read it with aread()/aiter_bytes(), or
+        release it with aclose().
+        """
+        method = method.upper()
+        client = self._client()
+        if params:
+            params = {key: value for key, value in params.items() if value is not None}
+        # Streamed bodies can't be replayed, so they are never retried
+        retryable = method in IDEMPOTENT_METHODS and not isinstance(
+            content, AsyncIterable
+        )
+        attempts = self.max_retries + 1 if retryable else 1
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            request = client.build_request(
+                method, url, params=params, headers=headers, content=content
+            )
+            try:
+                response = await client.send(request, stream=True)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+            else:
+                if last_attempt or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(self.backoff_factor * (2**attempt))
+        raise AssertionError("unreachable")  # pragma: no cover
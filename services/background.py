@@ -0,0 +1,37 @@
+"""
+Per-process background thread pools for short I/O-bound jobs that shouldn't
+hold up the request which triggered them.
+
+Jobs are neither persisted nor retried: queued or running, they are lost when
+the process exits, e.g. when gunicorn recycles the worker after max_requests.
+Callers that report progress must be able to tell such jobs apart, see
+apps.blog.image_ingest.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class BackgroundExecutor:
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_pid: int | None = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Gunicorn preloads the app in the master process, threads don't survive
+        # the fork: start the workers lazily in each process.
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return self._get_executor().submit(fn, *args, **kwargs)
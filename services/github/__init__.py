@@ -1,3 +1,3 @@
-from .github import github_service
+from .github import async_github_service, github_service
 
-__all__ = ["github_service"]
+__all__ = ["async_github_service", "github_service"]
@@ -1,7 +1,43 @@
+import json
+import logging
+import threading
+import time
 from typing import Any, NotRequired, TypedDict, Unpack
 
+import httpx
 import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from prometheus_client import Counter, Gauge
+from requests.utils import parse_header_links
+
+from services.async_http import AsyncHTTPClient
+from services.redis import CACHE_PREFIXES, RedisCacheHandler
+from utilities.content_hash import content_hash
+
+logger = logging.getLogger(__name__)
+
+GITHUB_RATE_LIMIT_REMAINING = Gauge(
+    "github_rate_limit_remaining",
+    "Requests left in the current GitHub rate limit window, by resource.",
+    ["resource"],
+)
+GITHUB_RATE_LIMIT_LIMIT = Gauge(
+    "github_rate_limit_limit",
+    "Requests allowed per GitHub rate limit window, by resource.",
+    ["resource"],
+)
+GITHUB_RATE_LIMIT_RESET = Gauge(
+    "github_rate_limit_reset_timestamp_seconds",
+    "When the current GitHub rate limit window resets, by resource.",
+    ["resource"],
+)
+GITHUB_CONDITIONAL_REQUESTS = Counter(
+    "github_conditional_requests_total",
+    "GitHub GETs by outcome: not_modified (304, free), modified, "
+    "or rate_limited (served from cache without a request).",
+    ["result"],
+)
 
 
 class RequestKwargs(TypedDict, total=False):
@@ -12,22 +48,154 @@ class RequestKwargs(TypedDict, total=False):
     timeout: NotRequired[int | tuple[int, int]]
 
 
-class GitHubClient:
+def _parse_links(link_header: str | None) -> dict[str, str]:
+    if not link_header:
+        return {}
+    return {
+        link["rel"]: link["url"]
+        for link in parse_header_links(link_header)
+        if "rel" in link
+    }
+
+
+class GitHubRateLimitError(Exception):
+    """Raised instead of calling GitHub while the rate limit is (nearly) spent."""
+
+
+class BaseGitHubClient:
+    """
+    Conditional request caching and rate limit tracking, shared by the sync
+    and async clients. Both keep their state in Redis, so it is common to
+    every worker whichever client they use.
+    """
+
     DEFAULT_TIMEOUT = (5, 30)  # (connect timeout, read timeout) in seconds
+    # Responses are kept with their validators for conditional requests
+    RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 1 week
+    RATE_LIMIT_NAME = "rate_limit"
 
     def __init__(self):
         self._token = settings.CLIENT_GITHUB_TOKEN
         self.base_url = settings.CLIENT_GITHUB_BASE_URL
         self.api_version = settings.CLIENT_GITHUB_API_VERSION
+        self.cache = RedisCacheHandler(
+            CACHE_PREFIXES["GITHUB"], self.RESPONSE_CACHE_TIMEOUT
+        )
+        self.default_headers = {
+            "Authorization": f"Bearer {self._token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": self.api_version,
+        }
+
+    def _endpoint(self, url: str) -> str:
+        """
+        Endpoints are relative to base_url. Absolute URLs, e.g. pagination
+        links, are accepted as long as they point to the API itself, so the
+        token is never sent anywhere else.
+        """
+        if "://" not in url:
+            return url
+        if not url.startswith(f"{self.base_url}/"):
+            raise ValueError(f"Not a GitHub API URL: {url}")
+        return url[len(self.base_url) :]
 
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Authorization": f"Bearer {self._token}",
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": self.api_version,
-            }
+    def _record_rate_limit(self, status_code: int, headers):
+        if "X-RateLimit-Remaining" in headers:
+            resource = headers.get("X-RateLimit-Resource", "core")
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = int(headers.get("X-RateLimit-Reset", 0))
+            GITHUB_RATE_LIMIT_REMAINING.labels(resource=resource).set(remaining)
+            GITHUB_RATE_LIMIT_RESET.labels(resource=resource).set(reset)
+            if "X-RateLimit-Limit" in headers:
+                GITHUB_RATE_LIMIT_LIMIT.labels(resource=resource).set(
+                    int(headers["X-RateLimit-Limit"])
+                )
+        else:
+            remaining, reset = None, 0
+
+        # Secondary rate limits only come with Retry-After
+        if status_code in (403, 429) and "Retry-After" in headers:
+            remaining, reset = 0, int(time.time()) + int(headers["Retry-After"])
+
+        if remaining is not None and reset > time.time():
+            # Shared by every worker until the window resets
+            self.cache.set_cache(
+                self.RATE_LIMIT_NAME,
+                {"remaining": remaining, "reset": reset},
+                timeout=int(reset - time.time()) + 1,
+            )
+
+    def _rate_limited(self) -> bool:
+        state = self.cache.get(self.RATE_LIMIT_NAME)
+        return (
+            state is not None
+            and state["remaining"] <= settings.CLIENT_GITHUB_RATE_LIMIT_RESERVE
+            and state["reset"] > time.time()
+        )
+
+    def _lookup(self, url: str, params: dict | None) -> tuple[str, dict | None]:
+        params = sorted((params or {}).items())
+        cache_name = f"response:{content_hash(url.encode(), params=params)}"
+        return cache_name, self.cache.get(cache_name)
+
+    def _serve_rate_limited(self, url: str, cached: dict | None):
+        if cached is None:
+            raise GitHubRateLimitError(
+                f"GitHub rate limit nearly spent, not requesting {url}"
+            )
+        GITHUB_CONDITIONAL_REQUESTS.labels(result="rate_limited").inc()
+        logger.warning(
+            "GitHub rate limit nearly spent, serving cached", extra={"url": url}
         )
+        return cached["body"], _parse_links(cached.get("link"))
+
+    def _conditional_headers(
+        self, cached: dict | None, headers: dict[str, str] | None
+    ) -> dict[str, str]:
+        headers = dict(headers or {})
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def _not_modified(self, cached: dict):
+        GITHUB_CONDITIONAL_REQUESTS.labels(result="not_modified").inc()
+        return cached["body"], _parse_links(cached.get("link"))
+
+    def _store_response(self, cache_name: str, headers, body):
+        GITHUB_CONDITIONAL_REQUESTS.labels(result="modified").inc()
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        link = headers.get("Link")
+        if etag or last_modified:
+            self.cache.set_cache(
+                cache_name,
+                {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "link": link,
+                    "body": body,
+                },
+            )
+        return body, _parse_links(link)
+
+
+class GitHubClient(BaseGitHubClient):
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        # requests.Session isn't documented as thread-safe: one per thread,
+        # e.g. per GitHubService.iter_pages() worker
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self.default_headers)
+        return session
 
     def _request(
         self, method: str, endpoint: str, **kwargs: Unpack[RequestKwargs]
@@ -37,9 +205,99 @@ class GitHubClient:
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.DEFAULT_TIMEOUT
         resp = self.session.request(method, url, **kwargs)
+        self._record_rate_limit(resp.status_code, resp.headers)
         resp.raise_for_status()
         return resp
 
     def get(self, url: str, **kwargs: Unpack[RequestKwargs]) -> dict[str, Any]:
-        response = self._request("GET", url, **kwargs)
-        return response.json()
+        """
+        GET a JSON payload. The last response per URL and params is cached
+        with its ETag/Last-Modified, and revalidated with a conditional
+        request: a 304 doesn't count against the rate limit. Near the limit,
+        the cached payload is returned without calling GitHub at all.
+        """
+        return self.get_page(url, **kwargs)[0]
+
+    def get_page(
+        self, url: str, **kwargs: Unpack[RequestKwargs]
+    ) -> tuple[Any, dict[str, str]]:
+        """
+        get(), along with the pagination links of the response's Link header,
+        e.g. {"next": <url>, "last": <url>}.
+        """
+        url = self._endpoint(url)
+        cache_name, cached = self._lookup(url, kwargs.get("params"))
+        if self._rate_limited():
+            return self._serve_rate_limited(url, cached)
+
+        headers = self._conditional_headers(cached, kwargs.pop("headers", None))
+        response = self._request("GET", url, headers=headers, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            return self._not_modified(cached)
+        return self._store_response(cache_name, response.headers, response.json())
+
+
+class AsyncGitHubClient(BaseGitHubClient):
+    """
+    Async counterpart of GitHubClient for views served through config.asgi:
+    the same get()/get_page(), awaited, so waiting on GitHub never holds a
+    worker. The cached responses and rate limit state are read and written
+    from a thread, off the event loop. Only params and headers are supported
+    as request options.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.http = AsyncHTTPClient(
+            self.base_url, timeout=self.DEFAULT_TIMEOUT, headers=self.default_headers
+        )
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: dict | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        response = await self.http.request(
+            method, endpoint, params=params, headers=headers
+        )
+        await sync_to_async(self._record_rate_limit)(
+            response.status_code, response.headers
+        )
+        if response.is_error:
+            await response.aread()
+            response.raise_for_status()
+        return response
+
+    async def get(self, url: str, **kwargs: Unpack[RequestKwargs]) -> dict[str, Any]:
+        """
+        See GitHubClient.get().
+        """
+        return (await self.get_page(url, **kwargs))[0]
+
+    async def get_page(
+        self, url: str, **kwargs: Unpack[RequestKwargs]
+    ) -> tuple[Any, dict[str, str]]:
+        """
+        See GitHubClient.get_page().
+        """
+        url = self._endpoint(url)
+        cache_name, cached = await sync_to_async(self._lookup)(
+            url, kwargs.get("params")
+        )
+        if await sync_to_async(self._rate_limited)():
+            return self._serve_rate_limited(url, cached)
+
+        headers = self._conditional_headers(cached, kwargs.get("headers"))
+        response = await self._request(
+            "GET", url, params=kwargs.get("params"), headers=headers
+        )
+        if response.status_code == 304 and cached is not None:
+            await response.aread()
+            return self._not_modified(cached)
+        body = json.loads(await response.aread())
+        return await sync_to_async(self._store_response)(
+            cache_name, response.headers, body
+        )
@@ -1,24 +1,144 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import fields
-from typing import Optional
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
 
-from .client import GitHubClient
+from django.conf import settings
+
+from .client import AsyncGitHubClient, GitHubClient
 from .dataclasses import RepositoriesParams
 
 
+def _page_number(url: str) -> int | None:
+    page = parse_qs(urlsplit(url).query).get("page")
+    return int(page[0]) if page else None
+
+
+def _repositories_query(params: Optional[RepositoriesParams]) -> dict | None:
+    if not params:
+        return None
+    valid_fields = {f.name for f in fields(RepositoriesParams)}
+    for key in params.__dict__:
+        if key not in valid_fields:
+            raise ValueError(f"Invalid parameter: {key}")
+    return {k: v for k, v in params.__dict__.items() if v is not None}
+
+
 class GitHubService:
     def __init__(self):
         self.client = GitHubClient()
 
+    def iter_pages(
+        self, endpoint: str, params: dict[str, Any] | None = None
+    ) -> Iterator[Any]:
+        """
+        Yield every item of a paginated endpoint, in order.
+
+        The first page's Link header tells the last page number; the pages
+        left are then fetched concurrently, by CLIENT_GITHUB_PAGE_WORKERS
+        threads, and yielded as soon as they arrive in order. Endpoints
+        without a page-numbered "last" link (e.g. cursor based ones) are
+        followed sequentially through "next", requested as given.
+        """
+        params = dict(params or {})
+        first_page = params.get("page") or 1
+        items, links = self.client.get_page(endpoint, params=params)
+        yield from items
+
+        last_page = _page_number(links["last"]) if "last" in links else None
+        if last_page is not None:
+
+            def fetch(page: int):
+                return self.client.get(endpoint, params={**params, "page": page})
+
+            pages = range(first_page + 1, last_page + 1)
+            workers = min(settings.CLIENT_GITHUB_PAGE_WORKERS, len(pages)) or 1
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="github-pages"
+            ) as executor:
+                for page_items in executor.map(fetch, pages):
+                    yield from page_items
+            return
+
+        while "next" in links:
+            items, links = self.client.get_page(links["next"])
+            yield from items
+
+    def iter_user_repositories(
+        self, params: Optional[RepositoriesParams] = None
+    ) -> Iterator[dict[str, Any]]:
+        """Stream every user repository from GitHub, following pagination."""
+        return self.iter_pages("/user/repos", params=_repositories_query(params))
+
     def get_user_repositories(self, params: Optional[RepositoriesParams] = None):
-        """Fetch user repositories from GitHub."""
-        query_params = None
-        if params:
-            valid_fields = {f.name for f in fields(RepositoriesParams)}
-            for key in params.__dict__:
-                if key not in valid_fields:
-                    raise ValueError(f"Invalid parameter: {key}")
-            query_params = {k: v for k, v in params.__dict__.items() if v is not None}
-        return self.client.get("/user/repos", params=query_params)
+        """Fetch all user repositories from GitHub."""
+        return list(self.iter_user_repositories(params=params))
+
+
+class AsyncGitHubService:
+    """
+    GitHubService for async views. Pages are fetched concurrently on the
+    event loop instead of threads; endpoints can be awaited together.
+    """
+
+    def __init__(self):
+        self.client = AsyncGitHubClient()
+
+    async def iter_pages(
+        self, endpoint: str, params: dict[str, Any] | None = None
+    ) -> AsyncIterator[Any]:
+        """
+        See GitHubService.iter_pages(), CLIENT_GITHUB_PAGE_WORKERS bounds the
+        number of pages requested at once.
+        """
+        params = dict(params or {})
+        first_page = params.get("page") or 1
+        items, links = await self.client.get_page(endpoint, params=params)
+        for item in items:
+            yield item
+
+        last_page = _page_number(links["last"]) if "last" in links else None
+        if last_page is not None:
+            semaphore = asyncio.Semaphore(settings.CLIENT_GITHUB_PAGE_WORKERS)
+
+            async def fetch(page: int):
+                async with semaphore:
+                    return await self.client.get(
+                        endpoint, params={**params, "page": page}
+                    )
+
+            tasks = [
+                asyncio.ensure_future(fetch(page))
+                for page in range(first_page + 1, last_page + 1)
+            ]
+            try:
+                for task in tasks:
+                    for item in await task:
+                        yield item
+            finally:
+                for task in tasks:
+                    task.cancel()
+            return
+
+        while "next" in links:
+            items, links = await self.client.get_page(links["next"])
+            for item in items:
+                yield item
+
+    def iter_user_repositories(
+        self, params: Optional[RepositoriesParams] = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream every user repository from GitHub, following pagination."""
+        return self.iter_pages("/user/repos", params=_repositories_query(params))
+
+    async def get_user_repositories(
+        self, params: Optional[RepositoriesParams] = None
+    ) -> list[dict[str, Any]]:
+        """Fetch all user repositories from GitHub."""
+        return [repo async for repo in self.iter_user_repositories(params=params)]
 
 
 github_service = GitHubService()
+async_github_service = AsyncGitHubService()
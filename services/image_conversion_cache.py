@@ -0,0 +1,212 @@
+"""
+Opt-in memoization of convert_image_to_webp.
+
+The conversion is a pure function of (image bytes, quality, max_width,
+max_height, max_pixels), so its result is stored under a digest of those
+inputs. Two size-bounded backends are available through IMAGE_CONVERSION_CACHE:
+
+- "disk": an LRU directory shared by every worker on the host, evicting the
+  least recently read entries once IMAGE_CONVERSION_CACHE_MAX_BYTES is reached.
+  Each process keeps a running total of what it wrote and only scans the
+  directory when that crosses the limit, or every DISK_SCAN_INTERVAL seconds
+  to account for the other workers' writes.
+- "redis": entries up to IMAGE_CONVERSION_CACHE_MAX_ENTRY_BYTES each, expiring
+  after IMAGE_CONVERSION_CACHE_TIMEOUT (Redis maxmemory bounds the total).
+
+Failed conversions are never cached.
+"""
+
+import base64
+import contextlib
+import functools
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from prometheus_client import Counter
+
+from services.image_pool import run_image_job
+from services.redis import CACHE_PREFIXES, RedisCacheHandler
+from utilities.content_hash import content_hash
+from utilities.convert_image_to_webp import convert_image_to_webp
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CONVERSION_CACHE_REQUESTS = Counter(
+    "image_conversion_cache_requests_total",
+    "Lookups in the image conversion result cache, by backend and result.",
+    ["backend", "result"],
+)
+
+# Bump when the converter output changes, so old entries stop matching
+CONVERTER_VERSION = 2
+
+# Longest a process goes without rescanning the shared disk cache directory
+DISK_SCAN_INTERVAL = 60  # seconds
+# Share of max_bytes eviction goes down to, so the next scan isn't one write away
+DISK_EVICT_TARGET = 0.9
+
+
+class DiskLRUCache:
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+        # Directory size as of the last scan plus what this process wrote since
+        self._total = 0
+        self._next_scan = 0.0
+
+    def get(self, key: str) -> bytes | None:
+        path = self.directory / key
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        if not data:
+            # Never a valid conversion, e.g. left by a write that failed
+            return None
+        # Reads refresh the entry, eviction goes by modification time. Unlike
+        # touch(), utime() doesn't recreate an entry evicted since the read.
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        return data
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(value)
+        os.replace(tmp_path, self.directory / key)
+
+        self._total += len(value)
+        if self._total > self.max_bytes or time.monotonic() >= self._next_scan:
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        # Only evict once over the limit, then make some headroom
+        target = self.max_bytes * DISK_EVICT_TARGET if total > self.max_bytes else total
+        for _mtime, size, path in sorted(entries):
+            if total <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+        self._total = total
+        self._next_scan = time.monotonic() + DISK_SCAN_INTERVAL
+
+
+class RedisBytesCache:
+    def __init__(self, timeout: int, max_entry_bytes: int):
+        self.cache = RedisCacheHandler(CACHE_PREFIXES["CONVERSIONS"], timeout)
+        self.max_entry_bytes = max_entry_bytes
+
+    def get(self, key: str) -> bytes | None:
+        # The JSON serializer can't hold bytes, values are base64 encoded
+        value = self.cache.get(key)
+        return base64.b64decode(value) if value is not None else None
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_entry_bytes:
+            return
+        self.cache.set_cache(key, base64.b64encode(value).decode("ascii"))
+
+
+@functools.cache
+def _get_disk_cache(directory: str, max_bytes: int) -> DiskLRUCache:
+    # One per process, it keeps the running total between writes
+    return DiskLRUCache(directory, max_bytes)
+
+
+def _get_backend() -> DiskLRUCache | RedisBytesCache | None:
+    backend = settings.IMAGE_CONVERSION_CACHE
+    if backend == "disk":
+        return _get_disk_cache(
+            settings.IMAGE_CONVERSION_CACHE_DIR,
+            settings.IMAGE_CONVERSION_CACHE_MAX_BYTES,
+        )
+    if backend == "redis":
+        return RedisBytesCache(
+            settings.IMAGE_CONVERSION_CACHE_TIMEOUT,
+            settings.IMAGE_CONVERSION_CACHE_MAX_ENTRY_BYTES,
+        )
+    return None
+
+
+def convert_image_to_webp_cached(
+    image_data: bytes,
+    quality: int = 85,
+    max_width: int | None = None,
+    max_height: int | None = None,
+    max_pixels: int | None = None,
+    wait_for_slot: float = 0,
+) -> tuple[bytes | None, str | None]:
+    """
+    convert_image_to_webp() behind the configured result cache. Misses are
+    converted in the image process pool, see run_image_job() for
+    ``wait_for_slot``.
+    """
+    backend = _get_backend()
+    if backend is None:
+        return run_image_job(
+            convert_image_to_webp,
+            image_data,
+            quality,
+            max_width,
+            max_height,
+            max_pixels,
+            wait_for_slot=wait_for_slot,
+        )
+
+    backend_name = settings.IMAGE_CONVERSION_CACHE
+    key = content_hash(
+        image_data,
+        quality=quality,
+        max_width=max_width,
+        max_height=max_height,
+        max_pixels=max_pixels,
+        version=CONVERTER_VERSION,
+    )
+    try:
+        webp_bytes = backend.get(key)
+    except Exception:
+        logger.exception("Image conversion cache lookup failed")
+        webp_bytes = None
+    if webp_bytes is not None:
+        IMAGE_CONVERSION_CACHE_REQUESTS.labels(backend=backend_name, result="hit").inc()
+        return webp_bytes, None
+
+    IMAGE_CONVERSION_CACHE_REQUESTS.labels(backend=backend_name, result="miss").inc()
+    webp_bytes, error = run_image_job(
+        convert_image_to_webp,
+        image_data,
+        quality,
+        max_width,
+        max_height,
+        max_pixels,
+        wait_for_slot=wait_for_slot,
+    )
+    if error is None:
+        try:
+            backend.set(key, webp_bytes)
+        except Exception:
+            logger.exception("Image conversion cache store failed")
+    return webp_bytes, error
@@ -0,0 +1,68 @@
+"""
+Process pool running the CPU-bound image transforms (Pillow decoding and
+WebP/AVIF encoding), so they never run inside a web worker.
+
+At most IMAGE_POOL_MAX_JOBS transforms are in flight across every gunicorn
+worker, however many there are; further ones are rejected instead of
+queueing behind them. Background callers, which nobody is waiting on, can
+ask to retry for a free slot instead.
+"""
+
+import logging
+import random
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from services.process_pool import BoundedProcessPool, PoolFullError
+
+logger = logging.getLogger(__name__)
+
+image_pool = BoundedProcessPool(
+    "images",
+    max_workers=settings.IMAGE_POOL_WORKERS,
+    max_jobs=settings.IMAGE_POOL_MAX_JOBS,
+    timeout=settings.IMAGE_POOL_TIMEOUT,
+    max_tasks_per_child=settings.IMAGE_POOL_MAX_TASKS_PER_CHILD,
+)
+
+# Backoff between attempts to get a slot, doubled up to the max, with jitter
+SLOT_RETRY_DELAY = 0.5  # seconds
+SLOT_RETRY_MAX_DELAY = 5  # seconds
+
+
+def _run_when_free(fn, args, kwargs, wait_for_slot: float):
+    deadline = time.monotonic() + wait_for_slot
+    delay = SLOT_RETRY_DELAY
+    while True:
+        try:
+            return image_pool.run(fn, *args, **kwargs)
+        except PoolFullError:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise
+            time.sleep(min(random.uniform(delay / 2, delay), remaining))
+            delay = min(delay * 2, SLOT_RETRY_MAX_DELAY)
+
+
+def run_image_job(fn, /, *args, wait_for_slot: float = 0, **kwargs) -> tuple:
+    """
+    Run a converter from utilities/convert_image_to_webp.py in the pool and
+    wait for it. Converters report failures as (None, error_message), pool
+    failures are returned the same way.
+
+    A full pool is reported straight away, unless ``wait_for_slot`` seconds
+    are given: background jobs retry with backoff until a slot frees up.
+    """
+    try:
+        return _run_when_free(fn, args, kwargs, wait_for_slot)
+    except PoolFullError:
+        logger.warning("Image job rejected, pool is full", extra={"job": fn.__name__})
+        return None, "The server is busy converting other images, try again shortly."
+    except TimeoutError:
+        logger.warning("Image job timed out", extra={"job": fn.__name__})
+        return None, f"Image conversion took longer than {image_pool.timeout}s."
+    except BrokenProcessPool:
+        logger.exception("Image job killed", extra={"job": fn.__name__})
+        return None, "Image conversion was interrupted."
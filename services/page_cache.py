@@ -0,0 +1,140 @@
+"""
+Surrogate-key page cache.
+
+Rendered pages are stored together with the token every surrogate key (tag)
+they depend on had when rendering started. Purging a key replaces its token,
+which makes every page stored under the old token a miss on its next lookup,
+so a save only evicts the pages that actually render the changed object.
+"""
+
+import hashlib
+import logging
+import uuid
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from services.redis import CACHE_PREFIXES, RedisCacheHandler
+
+logger = logging.getLogger(__name__)
+
+# Surrogate keys shared by the views and the invalidation signals
+PROFILE_KEY = "profile"
+POSTS_LIST_KEY = "posts-list"
+PROJECTS_KEY = "projects"
+RESUME_KEY = "resume"
+
+CACHE_HEADER = "X-Page-Cache"
+SURROGATE_KEY_HEADER = "Surrogate-Key"
+
+_cache = RedisCacheHandler(CACHE_PREFIXES["PAGES"], settings.PAGE_CACHE_TIMEOUT)
+
+
+def post_key(slug: str) -> str:
+    # By slug, the detail view reads its keys before the post is loaded
+    return f"post:{slug}"
+
+
+def _page_name(request) -> str:
+    url = request.build_absolute_uri()
+    return f"page:{hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()}"
+
+
+def _tag_name(key: str) -> str:
+    return f"tag:{key}"
+
+
+def is_cacheable_request(request) -> bool:
+    """
+    Only anonymous GET/HEAD requests share cached pages. Anyone holding a
+    session (i.e. the admin) always gets a freshly rendered page.
+    """
+    return (
+        settings.PAGE_CACHE_ENABLED
+        and request.method in ("GET", "HEAD")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def is_cacheable_response(request, response) -> bool:
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and "private" not in response.get("Cache-Control", "")
+        and "no-store" not in response.get("Cache-Control", "")
+    )
+
+
+def _current_tokens(keys: list[str], create: bool = False) -> dict[str, str | None]:
+    names = {_tag_name(key): key for key in keys}
+    found = _cache.get_many(list(names))
+    if create:
+        for name in names.keys() - found.keys():
+            _cache.add(name, uuid.uuid4().hex)
+            found[name] = _cache.get(name)
+    return {key: found.get(name) for name, key in names.items()}
+
+
+def surrogate_tokens(keys: list[str]) -> dict[str, str | None]:
+    """
+    The current token of each key, created if missing. Must be read before
+    rendering: a page rendered while one of its keys is purged then gets
+    stored under the old token, and is a miss from the start.
+    """
+    return _current_tokens(keys, create=True)
+
+
+def get_cached_page(request) -> HttpResponse | None:
+    """
+    Return the cached response for this request, or None when there is no
+    entry or one of its surrogate keys has been purged since it was stored.
+    """
+    entry = _cache.get(_page_name(request))
+    if entry is None:
+        return None
+    if _current_tokens(list(entry["keys"])) != entry["keys"]:
+        return None
+
+    response = HttpResponse(entry["content"], status=entry["status"])
+    for header, value in entry["headers"]:
+        response[header] = value
+    response[CACHE_HEADER] = "HIT"
+    return response
+
+
+def store_page(
+    request,
+    response,
+    tokens: dict[str, str | None],
+    timeout: int | None = None,
+):
+    """
+    Store a rendered response tagged with the surrogate keys of ``tokens``,
+    as read by surrogate_tokens() before the response was rendered.
+    """
+    response[SURROGATE_KEY_HEADER] = " ".join(tokens)
+    response[CACHE_HEADER] = "MISS"
+    if not is_cacheable_response(request, response):
+        return
+
+    entry = {
+        "content": response.content.decode(response.charset),
+        "status": response.status_code,
+        "headers": [
+            [header, value]
+            for header, value in response.items()
+            if header != CACHE_HEADER
+        ],
+        "keys": tokens,
+    }
+    _cache.set_cache(_page_name(request), entry, timeout)
+
+
+def purge_surrogate_keys(*keys: str):
+    """
+    Invalidate every cached page tagged with any of the given keys.
+    """
+    _cache.set_many({_tag_name(key): uuid.uuid4().hex for key in keys})
+    logger.info("Purged page cache surrogate keys", extra={"keys": list(keys)})
@@ -0,0 +1,264 @@
+"""
+Bounded process pools for CPU-heavy work (PDF renders, image transforms).
+
+Each web worker lazily owns a small ProcessPoolExecutor, while admission is
+controlled globally: a job first has to claim one of ``max_jobs`` Redis slots
+shared by every gunicorn worker, otherwise it is rejected with PoolFullError.
+Jobs that overrun ``timeout`` fail with TimeoutError inside the worker;
+a job stuck past the grace period on top of that gets the pool's processes
+killed. Both count from when a worker process reports starting the job, not
+from submission, and the job's slot is renewed at that point too. Killing
+the processes also fails the other jobs in flight in that pool; they are
+logged as such. Workers are recycled after ``max_tasks_per_child`` jobs.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from services.redis import CACHE_PREFIXES, RedisCacheHandler
+
+logger = logging.getLogger(__name__)
+
+_slots = RedisCacheHandler(CACHE_PREFIXES["POOLS"])
+
+# Extra time a job gets to honour its timeout before its process is killed
+KILL_GRACE = 10  # seconds
+
+
+class PoolFullError(Exception):
+    """Raised when a bounded pool has no free slot for another job."""
+
+
+# In worker processes, where jobs report that they started
+_started_queue = None
+
+
+def _init_worker(started_queue):
+    global _started_queue  # noqa: PLW0603
+    _started_queue = started_queue
+
+
+def _call_with_timeout(job_id: str, timeout: float, fn, args, kwargs):
+    """
+    Run in the worker process: report the job as started, then raise
+    TimeoutError in it once it has been running for ``timeout`` seconds,
+    queueing time not included.
+    """
+
+    def expire(_signum, _frame):
+        raise TimeoutError(f"Job exceeded its {timeout}s timeout")
+
+    # The executor reports jobs waiting in its call queue as running already
+    _started_queue.put(job_id)
+    signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class BoundedProcessPool:
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_workers: int,
+        max_jobs: int,
+        timeout: float,
+        max_tasks_per_child: int | None = None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_pid: int | None = None
+        # Job id -> set once a worker process has started the job
+        self._started: dict[str, threading.Event] = {}
+        self._stop_readers: dict[ProcessPoolExecutor, threading.Event] = {}
+        # Executor -> its unfinished futures and the name of their job
+        self._in_flight: dict[ProcessPoolExecutor, dict[Future, str]] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Gunicorn preloads the app in the master process; executor threads
+        # and pipes don't survive fork, so each worker builds its own.
+        pid = os.getpid()
+        with self._lock:
+            if self._executor is None or self._executor_pid != pid:
+                # Children start from a clean server process rather than a
+                # copy of the web worker, which also allows recycling them.
+                context = multiprocessing.get_context("forkserver")
+                started_queue = context.Queue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    max_tasks_per_child=self.max_tasks_per_child,
+                    initializer=_init_worker,
+                    initargs=(started_queue,),
+                )
+                self._executor_pid = pid
+                self._started = {}
+                stop = self._stop_readers[self._executor] = threading.Event()
+                threading.Thread(
+                    target=self._read_started,
+                    args=(started_queue, stop),
+                    name=f"{self.name}-started",
+                    daemon=True,
+                ).start()
+            return self._executor
+
+    def _read_started(self, started_queue, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                job_id = started_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            event = self._started.pop(job_id, None)
+            if event is not None:
+                event.set()
+        started_queue.close()
+
+    def _reset_executor(
+        self, executor: ProcessPoolExecutor, culprit: Future | None = None
+    ):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            stop = self._stop_readers.pop(executor, None)
+            in_flight = self._in_flight.pop(executor, {})
+        if stop is not None:
+            stop.set()
+        # No public API to stop a running task: kill the worker processes so
+        # the executor breaks and every pending future fails.
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        collateral = [job for future, job in in_flight.items() if future is not culprit]
+        if collateral:
+            logger.error(
+                "Process pool reset failed other jobs in flight",
+                extra={"pool": self.name, "jobs": collateral},
+            )
+
+    def _slot_name(self, index: int) -> str:
+        return f"{self.name}:slot:{index}"
+
+    @property
+    def _slot_timeout(self) -> int:
+        # A slot expires on its own if the worker holding it dies
+        return int(self.timeout) + KILL_GRACE + 30
+
+    def _acquire_slot(self) -> tuple[str, str] | None:
+        token = uuid.uuid4().hex
+        for index in range(self.max_jobs):
+            name = self._slot_name(index)
+            if _slots.add(name, token, self._slot_timeout):
+                return name, token
+        return None
+
+    def _renew_slot(self, name: str, token: str):
+        """
+        Restart the slot's expiry once its job starts: the time it spent
+        queued behind other jobs counted against the TTL set at submit.
+        """
+        if _slots.get(name) == token:
+            _slots.set_cache(name, token, self._slot_timeout)
+        elif not _slots.add(name, token, self._slot_timeout):
+            logger.warning(
+                "Process pool slot expired while its job was queued",
+                extra={"pool": self.name, "slot": name},
+            )
+
+    def _release_slot(self, name: str, token: str):
+        if _slots.get(name) == token:
+            _slots.delete(name)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        """
+        Schedule fn(*args, **kwargs) in a worker process. fn and its arguments
+        must be picklable and importable without Django being set up.
+        """
+        slot = self._acquire_slot()
+        if slot is None:
+            raise PoolFullError(f"Process pool '{self.name}' is full")
+
+        job_id = uuid.uuid4().hex
+        started = threading.Event()
+        job = (_call_with_timeout, job_id, self.timeout, fn, args, kwargs)
+        try:
+            executor = self._get_executor()
+            self._started[job_id] = started
+            try:
+                future = executor.submit(*job)
+            except BrokenProcessPool:
+                self._reset_executor(executor)
+                executor = self._get_executor()
+                self._started[job_id] = started
+                future = executor.submit(*job)
+        except BaseException:
+            self._started.pop(job_id, None)
+            self._release_slot(*slot)
+            raise
+
+        with self._lock:
+            self._in_flight.setdefault(executor, {})[future] = fn.__name__
+
+        def done(_future):
+            self._started.pop(job_id, None)
+            with self._lock:
+                self._in_flight.get(executor, {}).pop(_future, None)
+            self._release_slot(*slot)
+
+        future.add_done_callback(done)
+        threading.Thread(
+            target=self._watch,
+            args=(executor, future, started, slot, fn),
+            name=f"{self.name}-watchdog",
+            daemon=True,
+        ).start()
+        return future
+
+    def run(self, fn, /, *args, **kwargs):
+        """
+        Submit a job and wait for its result. Raises TimeoutError when the job
+        overran the pool timeout, BrokenProcessPool when it had to be killed.
+        """
+        return self.submit(fn, *args, **kwargs).result()
+
+    def _watch(
+        self,
+        executor: ProcessPoolExecutor,
+        future: Future,
+        started: threading.Event,
+        slot: tuple[str, str],
+        fn,
+    ):
+        # Queued jobs don't count: the hard deadline only starts once a worker
+        # process reports the job as started.
+        while not started.wait(self.timeout):
+            if future.done():
+                return
+        self._renew_slot(*slot)
+        if future.done():
+            # Finished while renewing: don't leave the slot held until its TTL
+            self._release_slot(*slot)
+        done, _ = wait([future], timeout=self.timeout + KILL_GRACE)
+        if done:
+            return
+        logger.error(
+            "Process pool job ignored its timeout, killing the pool",
+            extra={"pool": self.name, "job": fn.__name__, "timeout": self.timeout},
+        )
+        self._reset_executor(executor, future)
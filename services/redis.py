@@ -3,6 +3,13 @@ from django.core.cache import cache
 CACHE_TIMEOUT = 60 * 60  # 1 hour
 CACHE_PREFIXES = {
     "PROJECTS": "projects",
+    "CONTEXT": "context",
+    "PAGES": "pages",
+    "RESUME": "resume",
+    "POOLS": "pools",
+    "IMAGES": "images",
+    "CONVERSIONS": "conversions",
+    "GITHUB": "github",
 }
 
 
@@ -29,6 +36,22 @@ class RedisCacheHandler:
     def delete(self, name: str):
         return cache.delete(self._key(name))
 
+    def add(self, name: str, value, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        return cache.add(self._key(name), value, timeout)
+
+    def get_many(self, names: list[str]) -> dict:
+        keys = {self._key(name): name for name in names}
+        return {keys[key]: value for key, value in cache.get_many(keys).items()}
+
+    def set_many(self, values: dict, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        cache.set_many(
+            {self._key(name): value for name, value in values.items()}, timeout
+        )
+
     def get_or_set(self, name: str, default_value, timeout=None):
         if timeout is None:
             timeout = self.timeout
@@ -1,26 +1,150 @@
+import functools
+import io
+import json
+import logging
+import mimetypes
+import os
+import time
+import uuid
 from urllib.parse import urljoin
 
+import httpx
 import requests
 from django.conf import settings
+from prometheus_client import Histogram
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from services.async_http import AsyncHTTPClient
+
+logger = logging.getLogger(__name__)
+
+SEAWEEDFS_REQUEST_LATENCY = Histogram(
+    "seaweedfs_client_request_latency_seconds",
+    "Latency of SeaweedFS filer requests, by operation and outcome.",
+    ["operation", "outcome"],
+)
+
+# Only these methods are retried on read errors / 5xx responses. Uploads (POST)
+# are never replayed once the request has been sent.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+RETRY_STATUS_CODES = (502, 503, 504)
+# Block size in which streamed uploads are read from the file
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64 KB
 
 
 class SeaweedFSClient:
     """
     A minimal REST client for SeaweedFS filer API.
+
+    Requests go through a pooled keep-alive session with connect/read timeouts
+    and bounded retries for idempotent calls. Every call is recorded in the
+    ``seaweedfs_client_request_latency_seconds`` histogram.
     """
 
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout: tuple[float, float] | None = None,
+        max_retries: int | None = None,
+        backoff_factor: float | None = None,
+        pool_maxsize: int | None = None,
+    ):
         # base_url example: http://seaweedfs-filer:8888
         self.base_url = base_url.rstrip("/")
+        self.timeout = timeout or (
+            settings.SEAWEEDFS_CONNECT_TIMEOUT,
+            settings.SEAWEEDFS_READ_TIMEOUT,
+        )
+        self.max_retries = (
+            settings.SEAWEEDFS_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.backoff_factor = (
+            settings.SEAWEEDFS_RETRY_BACKOFF
+            if backoff_factor is None
+            else backoff_factor
+        )
+        self.pool_maxsize = pool_maxsize or settings.SEAWEEDFS_POOL_MAXSIZE
+
+        self._session: requests.Session | None = None
+        self._session_pid: int | None = None
+
+    @property
+    def session(self) -> requests.Session:
+        # Gunicorn preloads the app in the master process, so a session created
+        # at import time would hand the same sockets to every forked worker.
+        # Build the pool lazily, once per process.
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            self._session = self._build_session()
+            self._session_pid = pid
+        return self._session
+
+    def _build_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _url(self, file_path: str) -> str:
+        return urljoin(f"{self.base_url}/", file_path)
+
+    def _request(
+        self, operation: str, method: str, file_path: str, **kwargs
+    ) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self._url(file_path), **kwargs)
+            outcome = "success" if response.ok else "http_error"
+            return response
+        finally:
+            SEAWEEDFS_REQUEST_LATENCY.labels(
+                operation=operation, outcome=outcome
+            ).observe(time.perf_counter() - start)
 
     def upload_file(self, file_path: str, file_data: bytes):
         """
         Upload file_data (bytes or file object) to SeaweedFS under file_path.
         Example file_path: "uploads/myfile.png"
         """
-        url = urljoin(f"{self.base_url}/", file_path)
         files = {"file": (file_path, file_data)}
-        response = requests.post(url, files=files)
+        response = self._request("upload", "POST", file_path, files=files)
+        response.raise_for_status()
+        return response.json()
+
+    def upload_stream(self, file_path: str, fileobj, size: int):
+        """
+        Upload ``size`` bytes read from fileobj without loading them in memory.
+        Files above SEAWEEDFS_CHUNK_SIZE_MB are split by the filer into chunks
+        of that size, stored behind a chunk manifest.
+        """
+        body = MultipartFileStream(file_path, fileobj, size)
+        params = {}
+        if size > settings.SEAWEEDFS_CHUNK_SIZE_MB * 1024 * 1024:
+            params["maxMB"] = settings.SEAWEEDFS_CHUNK_SIZE_MB
+        response = self._request(
+            "upload",
+            "POST",
+            file_path,
+            params=params,
+            data=body,
+            headers={"Content-Type": body.content_type},
+        )
         response.raise_for_status()
         return response.json()
 
@@ -28,17 +152,34 @@ class SeaweedFSClient:
         """
         Retrieve a file's content as bytes.
         """
-        url = urljoin(f"{self.base_url}/", file_path)
-        response = requests.get(url)
+        response = self._request("get", "GET", file_path)
         response.raise_for_status()
         return response.content
 
+    def open_stream(
+        self,
+        file_path: str,
+        headers: dict[str, str] | None = None,
+        method: str = "GET",
+    ) -> requests.Response:
+        """
+        Open a streamed response for file_path without reading the body.
+        The caller owns the response and must close it.
+        """
+        return self._request("stream", method, file_path, headers=headers, stream=True)
+
+    def file_exists(self, file_path: str) -> bool:
+        """
+        Check whether file_path exists via a HEAD request.
+        """
+        response = self._request("exists", "HEAD", file_path)
+        return response.status_code == 200
+
     def delete_file(self, file_path: str):
         """
         Delete file from SeaweedFS.
         """
-        url = urljoin(f"{self.base_url}/", file_path)
-        response = requests.delete(url)
+        response = self._request("delete", "DELETE", file_path)
         response.raise_for_status()
         return True
 
@@ -47,7 +188,224 @@ class SeaweedFSClient:
         Return an accessible public URL (if filer port is exposed).
         On production, we need to return relative path and let nginx handle the file.
         """
+        return _public_file_url(self.base_url, file_path)
 
-        if settings.DEBUG:
-            return f"{self.base_url}/{file_path}"
-        return f"/{file_path}"
+
+class AsyncSeaweedFSClient:
+    """
+    Async counterpart of SeaweedFSClient for views served through config.asgi,
+    built on httpx. Same operations, timeouts, retry policy and latency
+    histogram, but network waits yield to the event loop instead of holding a
+    worker thread.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout: tuple[float, float] | None = None,
+        max_retries: int | None = None,
+        backoff_factor: float | None = None,
+        pool_maxsize: int | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.http = AsyncHTTPClient(
+            self.base_url,
+            timeout=timeout
+            or (settings.SEAWEEDFS_CONNECT_TIMEOUT, settings.SEAWEEDFS_READ_TIMEOUT),
+            max_retries=(
+                settings.SEAWEEDFS_MAX_RETRIES if max_retries is None else max_retries
+            ),
+            backoff_factor=(
+                settings.SEAWEEDFS_RETRY_BACKOFF
+                if backoff_factor is None
+                else backoff_factor
+            ),
+            pool_maxsize=pool_maxsize or settings.SEAWEEDFS_POOL_MAXSIZE,
+        )
+
+    async def _request(
+        self, operation: str, method: str, file_path: str, **kwargs
+    ) -> httpx.Response:
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            response = await self.http.request(method, file_path, **kwargs)
+            outcome = "success" if response.is_success else "http_error"
+            return response
+        finally:
+            SEAWEEDFS_REQUEST_LATENCY.labels(
+                operation=operation, outcome=outcome
+            ).observe(time.perf_counter() - start)
+
+    async def upload_file(self, file_path: str, file_data: bytes):
+        """
+        Upload file_data to SeaweedFS under file_path.
+        """
+        content_type, body = encode_multipart_file(file_path, file_data)
+        response = await self._request(
+            "upload",
+            "POST",
+            file_path,
+            headers={"Content-Type": content_type},
+            content=body,
+        )
+        payload = await response.aread()
+        response.raise_for_status()
+        return json.loads(payload)
+
+    async def upload_stream(self, file_path: str, fileobj, size: int):
+        """
+        Async counterpart of SeaweedFSClient.upload_stream(): the file is sent
+        in UPLOAD_CHUNK_SIZE blocks, never loaded in memory as a whole.
+        """
+        body = MultipartFileStream(file_path, fileobj, size)
+        params = {}
+        if size > settings.SEAWEEDFS_CHUNK_SIZE_MB * 1024 * 1024:
+            params["maxMB"] = settings.SEAWEEDFS_CHUNK_SIZE_MB
+
+        async def blocks():
+            while block := body.read(UPLOAD_CHUNK_SIZE):
+                yield block
+
+        response = await self._request(
+            "upload",
+            "POST",
+            file_path,
+            params=params,
+            # With a Content-Length, httpx sends the blocks as is, not chunked
+            headers={
+                "Content-Type": body.content_type,
+                "Content-Length": str(len(body)),
+            },
+            content=blocks(),
+        )
+        payload = await response.aread()
+        response.raise_for_status()
+        return json.loads(payload)
+
+    async def get_file(self, file_path: str) -> bytes:
+        """
+        Retrieve a file's content as bytes.
+        """
+        response = await self._request("get", "GET", file_path)
+        content = await response.aread()
+        response.raise_for_status()
+        return content
+
+    async def open_stream(
+        self,
+        file_path: str,
+        headers: dict[str, str] | None = None,
+        method: str = "GET",
+    ) -> httpx.Response:
+        """
+        Open a response for file_path without reading the body.
+        The caller owns the response and must consume it (aiter_bytes()) or
+        close it (aclose()).
+        """
+        return await self._request("stream", method, file_path, headers=headers)
+
+    async def file_exists(self, file_path: str) -> bool:
+        """
+        Check whether file_path exists via a HEAD request.
+        """
+        response = await self._request("exists", "HEAD", file_path)
+        # Reading the (empty) body keeps the connection for reuse
+        await response.aread()
+        return response.status_code == 200
+
+    async def delete_file(self, file_path: str):
+        """
+        Delete file from SeaweedFS.
+        """
+        response = await self._request("delete", "DELETE", file_path)
+        await response.aread()
+        response.raise_for_status()
+        return True
+
+    def get_file_url(self, file_path: str):
+        """
+        Return an accessible public URL, see SeaweedFSClient.get_file_url().
+        """
+        return _public_file_url(self.base_url, file_path)
+
+
+def _public_file_url(base_url: str, file_path: str) -> str:
+    if settings.DEBUG:
+        return f"{base_url}/{file_path}"
+    return f"/{file_path}"
+
+
+def _multipart_envelope(file_path: str) -> tuple[str, bytes, bytes]:
+    """
+    Return (content_type_header, head, tail) wrapping a file as the single
+    ``file`` field of a multipart/form-data body.
+    """
+    boundary = uuid.uuid4().hex
+    part_headers = (
+        f'Content-Disposition: form-data; name="file"; filename="{file_path}"\r\n'
+    )
+    guessed_type, _ = mimetypes.guess_type(file_path)
+    if guessed_type:
+        part_headers += f"Content-Type: {guessed_type}\r\n"
+    return (
+        f"multipart/form-data; boundary={boundary}",
+        f"--{boundary}\r\n{part_headers}\r\n".encode(),
+        f"\r\n--{boundary}--\r\n".encode(),
+    )
+
+
+def encode_multipart_file(file_path: str, file_data: bytes) -> tuple[str, bytes]:
+    """
+    Encode file_data as the single ``file`` field of a multipart/form-data body.
+    Returns (content_type_header, body).
+    """
+    content_type, head, tail = _multipart_envelope(file_path)
+    return content_type, b"".join([head, file_data, tail])
+
+
+class MultipartFileStream:
+    """
+    File-like multipart/form-data body reading the file part from ``fileobj``
+    on demand. Its length is known upfront, so requests sends it with a
+    Content-Length and streams it through ``read()`` in blocks, keeping
+    memory constant whatever the file size.
+    """
+
+    def __init__(self, file_path: str, fileobj, size: int):
+        self.content_type, head, tail = _multipart_envelope(file_path)
+        self._parts = [io.BytesIO(head), fileobj, io.BytesIO(tail)]
+        self._length = len(head) + size + len(tail)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._parts and (size < 0 or size > 0):
+            data = self._parts[0].read(size)
+            if not data:
+                self._parts.pop(0)
+                continue
+            chunks.append(data)
+            if size > 0:
+                size -= len(data)
+        return b"".join(chunks)
+
+
+@functools.cache
+def get_seaweedfs_client(base_url: str) -> SeaweedFSClient:
+    """
+    Return the process-wide client for base_url so the storage backend and the
+    media views share a single connection pool.
+    """
+    return SeaweedFSClient(base_url)
+
+
+@functools.cache
+def get_async_seaweedfs_client(base_url: str) -> AsyncSeaweedFSClient:
+    """
+    Return the process-wide async client for base_url.
+    """
+    return AsyncSeaweedFSClient(base_url)
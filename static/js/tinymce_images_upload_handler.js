@@ -5,6 +5,31 @@ function tinymce_images_upload_handler(blobInfo, progress) {
             const parts = value.split(`; ${name}=`);
             if (parts.length === 2) return parts.pop().split(';').shift();
         };
+        // The server keeps the original until its WebP conversion finishes in the
+        // background; poll for it and point the inserted image at the WebP.
+        const swapWhenIngested = (location, attempt = 0) => {
+            if (attempt >= 40) return;
+            setTimeout(() => {
+                fetch('/admin/tinymce-upload/status/?location=' + encodeURIComponent(location), { credentials: 'same-origin' })
+                    .then((response) => response.ok ? response.json() : null)
+                    .then((status) => {
+                        if (!status || status.status === 'failed') return;
+                        if (status.status !== 'ready') {
+                            swapWhenIngested(location, attempt + 1);
+                            return;
+                        }
+                        tinymce.get().forEach((editor) => {
+                            editor.dom.select('img').forEach((img) => {
+                                if (img.getAttribute('src') === location) {
+                                    editor.dom.setAttribs(img, { src: status.location, 'data-mce-src': status.location });
+                                }
+                            });
+                        });
+                    })
+                    .catch(() => swapWhenIngested(location, attempt + 1));
+            }, 1500);
+        };
+
         const xhr = new XMLHttpRequest();
         xhr.withCredentials = true;
         xhr.open('POST', '/admin/tinymce-upload/');
@@ -34,6 +59,10 @@ function tinymce_images_upload_handler(blobInfo, progress) {
             }
 
             resolve(json.location);
+
+            if (json.status === 'pending') {
+                swapWhenIngested(json.location);
+            }
         };
 
         xhr.onerror = () => {
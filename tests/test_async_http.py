@@ -0,0 +1,183 @@
+import asyncio
+import io
+
+import httpx
+from django.test import SimpleTestCase, override_settings
+from services.async_http import AsyncHTTPClient
+from services.seaweedfs import AsyncSeaweedFSClient
+
+
+class _FakeServer:
+    """Tiny HTTP/1.1 server answering from a list of canned responses."""
+
+    def __init__(self, responses, requests_per_connection=None):
+        self.responses = list(responses)
+        self.requests = []
+        self.connections = 0
+        self.requests_per_connection = requests_per_connection
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        served = 0
+        while served != self.requests_per_connection:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            request_line, *header_lines = head.decode().split("\r\n")
+            headers = dict(line.split(": ", 1) for line in header_lines if ": " in line)
+            body = b""
+            if "Content-Length" in headers:
+                body = await reader.readexactly(int(headers["Content-Length"]))
+            self.requests.append((request_line, headers, body))
+            writer.write(self.responses.pop(0))
+            await writer.drain()
+            served += 1
+        writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def __aexit__(self, *exc_info):
+        self.server.close()
+
+
+def _response(status, body=b"", headers=""):
+    return (
+        f"HTTP/1.1 {status}\r\nContent-Length: {len(body)}\r\n{headers}\r\n".encode()
+        + body
+    )
+
+
+class AsyncHTTPClientTests(SimpleTestCase):
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_reuses_keep_alive_connection(self):
+        server = _FakeServer([_response("200 OK", b"one"), _response("200 OK", b"two")])
+
+        async def scenario():
+            async with server as base_url:
+                client = AsyncHTTPClient(base_url)
+                first = await (await client.request("GET", "/a")).aread()
+                second = await (await client.request("GET", "/b")).aread()
+                return first, second
+
+        self.assertEqual(self.run_async(scenario()), (b"one", b"two"))
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(server.requests[1][0], "GET /b HTTP/1.1")
+
+    def test_reads_chunked_body_in_chunks(self):
+        chunked = (
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n"
+        )
+        server = _FakeServer([chunked])
+
+        async def scenario():
+            async with server as base_url:
+                response = await AsyncHTTPClient(base_url).request("GET", "/")
+                return [chunk async for chunk in response.aiter_bytes()]
+
+        self.assertEqual(b"".join(self.run_async(scenario())), b"hello world")
+
+    def test_head_response_has_no_body(self):
+        server = _FakeServer(
+            [b"HTTP/1.1 200 OK\r\nContent-Length: 42\r\n\r\n", _response("200 OK")]
+        )
+
+        async def scenario():
+            async with server as base_url:
+                client = AsyncHTTPClient(base_url)
+                response = await client.request("HEAD", "/file")
+                await response.aread()
+                await (await client.request("GET", "/file")).aread()
+                return response.status_code
+
+        self.assertEqual(self.run_async(scenario()), 200)
+        self.assertEqual(server.connections, 1)
+
+    def test_retries_idempotent_requests_on_server_errors(self):
+        server = _FakeServer(
+            [_response("503 Service Unavailable"), _response("200 OK", b"ok")]
+        )
+
+        async def scenario():
+            async with server as base_url:
+                client = AsyncHTTPClient(base_url, max_retries=2)
+                return await (await client.request("GET", "/")).aread()
+
+        self.assertEqual(self.run_async(scenario()), b"ok")
+        self.assertEqual(len(server.requests), 2)
+
+    def test_post_is_not_retried(self):
+        server = _FakeServer([_response("503 Service Unavailable")])
+
+        async def scenario():
+            async with server as base_url:
+                client = AsyncHTTPClient(base_url, max_retries=2)
+                response = await client.request("POST", "/upload", content=b"payload")
+                await response.aread()
+                response.raise_for_status()
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.run_async(scenario())
+        self.assertEqual(server.requests[0][2], b"payload")
+
+    def test_post_after_keep_alive_connection_was_closed(self):
+        # The server drops idle connections without saying so
+        server = _FakeServer(
+            [_response("200 OK", b"one"), _response("200 OK", b"two")],
+            requests_per_connection=1,
+        )
+
+        async def scenario():
+            async with server as base_url:
+                client = AsyncHTTPClient(base_url)
+                first = await client.request("POST", "/upload", content=b"1")
+                await first.aread()
+                await asyncio.sleep(0.1)
+                second = await client.request("POST", "/upload", content=b"2")
+                return await second.aread()
+
+        self.assertEqual(self.run_async(scenario()), b"two")
+        self.assertEqual(server.connections, 2)
+
+    def test_params_are_encoded_in_target(self):
+        server = _FakeServer([_response("200 OK")])
+
+        async def scenario():
+            async with server as base_url:
+                client = AsyncHTTPClient(base_url)
+                await (
+                    await client.request("GET", "/repos", params={"page": 2, "x": None})
+                ).aread()
+
+        self.run_async(scenario())
+        self.assertEqual(server.requests[0][0], "GET /repos?page=2 HTTP/1.1")
+
+
+class AsyncSeaweedFSClientTests(SimpleTestCase):
+    @override_settings(SEAWEEDFS_CHUNK_SIZE_MB=1)
+    def test_upload_stream_sends_file_with_content_length(self):
+        server = _FakeServer([_response("201 Created", b'{"size": 3145728}')])
+        data = b"x" * (3 * 1024 * 1024)
+
+        async def scenario():
+            async with server as base_url:
+                client = AsyncSeaweedFSClient(base_url)
+                return await client.upload_stream(
+                    "uploads/file.bin", io.BytesIO(data), len(data)
+                )
+
+        self.assertEqual(self.run_async(scenario()), {"size": 3145728})
+        request_line, headers, body = server.requests[0]
+        self.assertEqual(request_line, "POST /uploads/file.bin?maxMB=1 HTTP/1.1")
+        self.assertEqual(int(headers["Content-Length"]), len(body))
+        self.assertNotIn("Transfer-Encoding", headers)
+        self.assertIn(data, body)
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
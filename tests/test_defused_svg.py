@@ -0,0 +1,56 @@
+import io
+
+from django.test import SimpleTestCase
+from utilities.defused_svg import is_safe_svg, sanitize_svg
+
+SVG_OPEN = (
+    b'<svg xmlns="http://www.w3.org/2000/svg" '
+    b'xmlns:xlink="http://www.w3.org/1999/xlink">'
+)
+
+
+class DefusedSvgTests(SimpleTestCase):
+
+    def test_safe_svg(self):
+        svg = SVG_OPEN + b'<a xlink:href="https://example.com"><path d="M0"/></a></svg>'
+        self.assertEqual(is_safe_svg(svg), (True, ""))
+        self.assertEqual(is_safe_svg(io.BytesIO(svg)), (True, ""))
+
+    def test_rejects_first_violation(self):
+        svg = SVG_OPEN + b'<script>alert(1)</script><g onload="x"/></svg>'
+        is_safe, error_msg = is_safe_svg(svg)
+        self.assertFalse(is_safe)
+        self.assertIn("<script>", error_msg)
+
+    def test_rejects_dangerous_urls(self):
+        for element in (
+            b'<a xlink:href=" JavaScript:alert(1)"/>',
+            b'<rect style="fill: url(javascript:alert(1))"/>',
+        ):
+            with self.subTest(element=element):
+                self.assertFalse(is_safe_svg(SVG_OPEN + element + b"</svg>")[0])
+
+    def test_rejects_non_svg_root(self):
+        self.assertFalse(is_safe_svg(b"<html><svg/></html>")[0])
+
+    def test_limits(self):
+        deep = b"<svg>" + b"<g>" * 5 + b"</g>" * 5 + b"</svg>"
+        self.assertFalse(is_safe_svg(deep, max_depth=5)[0])
+        self.assertFalse(is_safe_svg(deep, max_elements=5)[0])
+        self.assertFalse(is_safe_svg(deep, max_bytes=10)[0])
+        self.assertTrue(is_safe_svg(deep, max_depth=6, max_elements=6)[0])
+
+    def test_sanitize_strips_offending_nodes(self):
+        svg = (
+            SVG_OPEN
+            + b'<script>alert(1)<g/></script><g onclick="x" fill="red">'
+            + b'<a xlink:href="javascript:alert(1)">text</a></g></svg>'
+        )
+        sanitized, removed, error_msg = sanitize_svg(svg)
+        self.assertEqual(error_msg, "")
+        self.assertEqual(len(removed), 3)
+        self.assertEqual(
+            sanitized,
+            b'<svg xmlns="http://www.w3.org/2000/svg"><g fill="red"><a>text</a></g></svg>',
+        )
+        self.assertTrue(is_safe_svg(sanitized)[0])
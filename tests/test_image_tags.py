@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase, override_settings
+
+from apps.blog.models import Posts
+from apps.blog.templatetags.image_tags import picture
+
+
+@override_settings(
+    IMAGE_RENDITION_WIDTHS=[320, 640, 1024], IMAGE_RENDITION_FORMATS=["webp"]
+)
+class PictureTagTests(SimpleTestCase):
+    def srcset(self, **fields):
+        post = Posts(thumbnail="posts/thumbnails/abc.webp", **fields)
+        html = picture(post.thumbnail)
+        return html.split('srcset="')[1].split('"')[0]
+
+    def test_lists_configured_widths(self):
+        self.assertEqual(
+            self.srcset(thumbnail_width=2048),
+            "/posts/thumbnails/abc-320w.webp 320w, "
+            "/posts/thumbnails/abc-640w.webp 640w, "
+            "/posts/thumbnails/abc-1024w.webp 1024w",
+        )
+
+    def test_advertises_source_width_instead_of_upscaling(self):
+        self.assertEqual(
+            self.srcset(thumbnail_width=500),
+            "/posts/thumbnails/abc-320w.webp 320w, "
+            "/posts/thumbnails/abc-640w.webp 500w",
+        )
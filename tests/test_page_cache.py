@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.contrib.auth.models import update_last_login
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.blog.models import Posts, Profile, User
+from services.page_cache import CACHE_HEADER, SURROGATE_KEY_HEADER, post_key
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    PAGE_CACHE_ENABLED=True,
+)
+class PostDetailPageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("root", first_name="Root")
+        Profile.objects.create(user=cls.user)
+        cls.post = Posts.objects.create(
+            title="Cached post",
+            slug="cached-post",
+            content="<p>First version</p>",
+            year=2024,
+            author=cls.user,
+            status=Posts.PUBLISHED,
+        )
+
+    def setUp(self):
+        self.url = reverse("blog:post_detail", kwargs={"slug": self.post.slug})
+
+    def test_miss_then_hit(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response[CACHE_HEADER], "MISS")
+        self.assertIn(post_key(self.post.slug), response[SURROGATE_KEY_HEADER])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response[CACHE_HEADER], "HIT")
+        self.assertContains(response, "First version")
+
+    def test_post_save_purges_page(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.content = "<p>Second version</p>"
+            self.post.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response[CACHE_HEADER], "MISS")
+        self.assertContains(response, "Second version")
+
+    def test_slug_change_purges_old_url(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.slug = "renamed-post"
+            self.post.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_session_bypasses_cache(self):
+        self.client.get(self.url)
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = "session"
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(CACHE_HEADER, response)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class RootUserInvalidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("root")
+
+    def test_login_does_not_purge_profile_pages(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            update_last_login(None, self.user)
+        self.assertEqual(callbacks, [])
+
+    def test_profile_change_purges_profile_pages(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.first_name = "Root"
+            self.user.save()
+        self.assertNotEqual(callbacks, [])
@@ -1,5 +1,5 @@
 from django.test import SimpleTestCase
-from utilities.resolve_variables import VariableResolver
+from utilities.resolve_variables import VariableResolver, compile_template
 
 
 class ResolveVariablesTests(SimpleTestCase):
@@ -76,3 +76,19 @@ class ResolveVariablesTests(SimpleTestCase):
         expected = "GitHub: {variable.PROFILE.SOCIAL.LINKEDIN.URL}"
         resolver = VariableResolver(input_str, lookup)
         self.assertEqual(resolver.resolve(), expected)
+
+    def test_compiled_template_is_reused(self):
+        input_str = "Hi {variable.NAME}"
+        self.assertIs(compile_template(input_str), compile_template(input_str))
+        self.assertEqual(compile_template(input_str).render({"name": "Bob"}), "Hi Bob")
+
+    def test_none_value_keeps_placeholder(self):
+        input_str = "Born in {variable.YEAR}"
+        resolver = VariableResolver(input_str, {"year": None})
+        self.assertEqual(resolver.resolve(), input_str)
+
+    def test_resolve_many(self):
+        lookup = {"name": "Bob", "profile": {"bio": "Dev"}}
+        documents = ["{variable.NAME}", "{variable.PROFILE.BIO}!", "plain"]
+        expected = ["Bob", "Dev!", "plain"]
+        self.assertEqual(VariableResolver.resolve_many(documents, lookup), expected)
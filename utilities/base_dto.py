@@ -3,6 +3,9 @@ from typing import Any
 
 
 class BaseDto(ABC):
+    # Lets slotted subclasses go without a per-instance __dict__
+    __slots__ = ()
+
     @abstractmethod
     def to_dict(self) -> dict[str, Any]:
         pass
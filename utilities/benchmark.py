@@ -0,0 +1,92 @@
+"""
+Helpers shared by the benchmark management commands: timing, latency
+percentiles, peak RSS measured in a fresh process, and JSON result files
+that can be diffed between runs.
+"""
+
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from importlib.metadata import version
+
+
+def peak_rss_bytes() -> int:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(fn, args=(), kwargs=None, repeat=1) -> dict:
+    """
+    Call fn(*args, **kwargs) ``repeat`` times. Returns the latency of each
+    call in seconds, the last result and the process RSS before/after.
+    """
+    kwargs = kwargs or {}
+    baseline_rss = peak_rss_bytes()
+    latencies = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "latencies": latencies,
+        "result": result,
+        "baseline_rss_bytes": baseline_rss,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def measure_isolated(fn, args=(), kwargs=None, repeat=1) -> dict:
+    """
+    measure() in a process of its own, so the reported peak RSS is that of
+    this workload only. fn and its arguments must be picklable.
+    """
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("forkserver")
+    ) as executor:
+        return executor.submit(measure, fn, args, kwargs, repeat).result()
+
+
+def summarize(latencies: list[float]) -> dict:
+    """
+    Throughput and latency percentiles (in milliseconds) of serial calls.
+    """
+    total = sum(latencies)
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95 = percentiles[49], percentiles[94]
+    else:
+        p50 = p95 = latencies[0]
+    return {
+        "count": len(latencies),
+        "per_second": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": round(p50 * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+def write_results(path: str, name: str, params: dict, results: list[dict]):
+    """
+    Save a benchmark run along with what is needed to compare it to another.
+    """
+    payload = {
+        "benchmark": name,
+        "created_at": datetime.now(UTC).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": multiprocessing.cpu_count(),
+            "pillow": version("pillow"),
+        },
+        "params": params,
+        "results": results,
+    }
+    with open(path, "w") as results_file:
+        json.dump(payload, results_file, indent=2)
@@ -0,0 +1,15 @@
+import hashlib
+
+
+def content_hash(data: bytes, **params) -> str:
+    """
+    Stable name for the output of processing ``data`` with ``params``: the
+    same bytes uploaded with the same conversion settings always map to the
+    same object, which can then be reused instead of re-encoded.
+
+    Returns 32 hex characters, the length of the uuid4().hex names it replaces.
+    """
+    hasher = hashlib.sha256(data)
+    for key, value in sorted(params.items()):
+        hasher.update(f"\0{key}={value}".encode())
+    return hasher.hexdigest()[:32]
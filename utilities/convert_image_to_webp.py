@@ -1,16 +1,181 @@
 import io
 import logging
+import resource
 
 from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+# Pillow encoder name and options for each rendition format
+RENDITION_FORMATS = {
+    "webp": ("WEBP", {"method": 6}),
+    "avif": ("AVIF", {"speed": 6}),
+}
+
+
+class PixelBudgetError(Exception):
+    """Raised before decoding an image that would exceed the pixel budget."""
+
+
+def _fit_size(
+    size: tuple[int, int], max_width: int | None, max_height: int | None
+) -> tuple[int, int]:
+    original_width, original_height = size
+    if not (max_width or max_height):
+        return size
+
+    # Calculate new dimensions maintaining aspect ratio
+    if max_width and max_height:
+        ratio = min(max_width / original_width, max_height / original_height)
+    elif max_width:
+        ratio = max_width / original_width
+    else:  # max_height only
+        ratio = max_height / original_height
+
+    # Only resize if image is larger than max dimensions
+    if ratio >= 1:
+        return size
+    return int(original_width * ratio), int(original_height * ratio)
+
+
+def _open_image(
+    image_data: bytes,
+    max_width: int | None = None,
+    max_height: int | None = None,
+    max_pixels: int | None = None,
+) -> Image.Image:
+    """
+    Open and decode an image, no larger than needed for the target size.
+
+    Only the header is read before the checks below. JPEGs at least twice
+    the target size are decoded straight at 1/2, 1/4 or 1/8 scale, never
+    below the target; the final LANCZOS pass does the rest. The size left to
+    decode is then checked against ``max_pixels``.
+    """
+    image = Image.open(io.BytesIO(image_data))
+    target_size = _fit_size(image.size, max_width, max_height)
+    if target_size != image.size:
+        # No-op for formats without scaled decoding
+        image.draft(None, target_size)
+
+    width, height = image.size
+    if max_pixels and width * height > max_pixels:
+        raise PixelBudgetError(
+            f"Image is {width}x{height} pixels, "
+            f"above the {max_pixels} pixels decoding budget."
+        )
+    image.load()
+    return image
+
+
+def _decoded_info(image: Image.Image) -> dict:
+    width, height = image.size
+    return {
+        "decoded_size": f"{width}x{height}",
+        "decoded_bytes": width * height * len(image.getbands()),
+    }
+
+
+def _peak_rss() -> int | None:
+    # VmHWM, the process RSS high-water mark, in kB
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> int | None:
+    """
+    Reset the process RSS high-water mark (Linux only), so the peak logged
+    after a conversion is that of the conversion, not of the worker's whole
+    lifetime. Pillow allocates pixel buffers outside of the Python allocator,
+    where tracemalloc can't see them. Returns the RSS the conversion starts
+    from, None when the mark can't be reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return None
+    return _peak_rss()
+
+
+def _log_memory(decoded: dict, baseline_rss: int | None, **extra):
+    if baseline_rss is None:
+        # ru_maxrss is in KiB, and only ever grows over the worker's lifetime
+        memory = {
+            "lifetime_peak_rss_bytes": (
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            )
+        }
+    else:
+        memory = {"baseline_rss_bytes": baseline_rss, "peak_rss_bytes": _peak_rss()}
+    logger.info("Image conversion memory", extra={**decoded, **memory, **extra})
+
+
+def _flatten_image(image: Image.Image) -> Image.Image:
+    # Convert RGBA to RGB if necessary (WebP supports both, but RGB is more efficient)
+    if image.mode in ("RGBA", "LA", "P"):
+        # Create a white background for transparency
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        if image.mode == "P":
+            image = image.convert("RGBA")
+        background.paste(
+            image, mask=image.split()[-1] if image.mode in ("RGBA", "LA") else None
+        )
+        return background
+    if image.mode not in ("RGB", "L"):
+        return image.convert("RGB")
+    return image
+
+
+def _resize_to_fit(
+    image: Image.Image, max_width: int | None, max_height: int | None
+) -> Image.Image:
+    new_size = _fit_size(image.size, max_width, max_height)
+    if new_size == image.size:
+        return image
+
+    original_width, original_height = image.size
+    new_width, new_height = new_size
+    logger.info(
+        f"Resized image from {original_width}x{original_height} to {new_width}x{new_height}"
+    )
+    # reducing_gap box-averages by an integer factor first (Image.reduce),
+    # so LANCZOS only runs over an image at most twice the target size
+    return image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+
+def _conversion_error(error: Exception) -> str:
+    if isinstance(error, PixelBudgetError):
+        # Expected rejection, no traceback needed
+        logger.warning(str(error))
+        return str(error)
+    if isinstance(error, Image.UnidentifiedImageError):
+        error_msg = "Unable to identify image format. The file may be corrupted or not a valid image."
+    elif isinstance(error, Image.DecompressionBombError):
+        error_msg = "Image is too large and may be a decompression bomb attack."
+    elif isinstance(error, OSError):
+        error_msg = f"OS error while processing image: {error!s}"
+    elif isinstance(error, MemoryError):
+        error_msg = "Not enough memory to process the image."
+    else:
+        error_msg = f"Unexpected error converting image to WebP: {error!s}"
+    logger.exception(error_msg)
+    return error_msg
+
 
 def convert_image_to_webp(
     image_data: bytes,
     quality: int = 85,
     max_width: int | None = None,
     max_height: int | None = None,
+    max_pixels: int | None = None,
+    method: int = 6,
 ) -> tuple[bytes | None, str | None]:
     """
     Convert an image to WebP format using Pillow.
@@ -20,85 +185,94 @@ def convert_image_to_webp(
         quality: WebP quality (1-100, default 85)
         max_width: Optional maximum width to resize to (maintains aspect ratio)
         max_height: Optional maximum height to resize to (maintains aspect ratio)
+        max_pixels: Optional budget of pixels to decode, images still above
+            it after scaled decoding are rejected without being decoded
+        method: WebP encoder effort (0 fastest - 6 smallest output, default 6)
 
     Returns:
         A tuple of (webp_bytes, error_message).
         - If successful: (bytes, None)
         - If failed: (None, error_message_string)
     """
-    try:
-        # Validate quality parameter
-        if not 1 <= quality <= 100:
-            return None, f"Quality must be between 1 and 100, got {quality}"
+    # Validate quality parameter
+    if not 1 <= quality <= 100:
+        return None, f"Quality must be between 1 and 100, got {quality}"
 
+    try:
+        baseline_rss = _reset_peak_rss()
         # Open the image from bytes
-        image = Image.open(io.BytesIO(image_data))
-
-        # Convert RGBA to RGB if necessary (WebP supports both, but RGB is more efficient)
-        if image.mode in ("RGBA", "LA", "P"):
-            # Create a white background for transparency
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            if image.mode == "P":
-                image = image.convert("RGBA")
-            background.paste(
-                image, mask=image.split()[-1] if image.mode in ("RGBA", "LA") else None
-            )
-            image = background
-        elif image.mode not in ("RGB", "L"):
-            image = image.convert("RGB")
+        image = _open_image(image_data, max_width, max_height, max_pixels)
+        decoded = _decoded_info(image)
+        image = _flatten_image(image)
 
         # Resize if max dimensions are specified
-        if max_width or max_height:
-            original_width, original_height = image.size
-
-            # Calculate new dimensions maintaining aspect ratio
-            if max_width and max_height:
-                ratio = min(max_width / original_width, max_height / original_height)
-            elif max_width:
-                ratio = max_width / original_width
-            else:  # max_height only
-                ratio = max_height / original_height
-
-            # Only resize if image is larger than max dimensions
-            if ratio < 1:
-                new_width = int(original_width * ratio)
-                new_height = int(original_height * ratio)
-                image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                logger.info(
-                    f"Resized image from {original_width}x{original_height} to {new_width}x{new_height}"
-                )
+        image = _resize_to_fit(image, max_width, max_height)
 
         # Convert to WebP
         output = io.BytesIO()
-        image.save(output, format="WEBP", quality=quality, method=6)
+        image.save(output, format="WEBP", quality=quality, method=method)
         webp_bytes = output.getvalue()
+        _log_memory(decoded, baseline_rss, source_bytes=len(image_data))
 
         logger.info(
             f"Successfully converted image to WebP (quality={quality}, size={len(webp_bytes)} bytes)"
         )
         return webp_bytes, None
 
-    except Image.UnidentifiedImageError:
-        error_msg = "Unable to identify image format. The file may be corrupted or not a valid image."
-        logger.exception(error_msg)
-        return None, error_msg
+    except Exception as e:
+        return None, _conversion_error(e)
 
-    except Image.DecompressionBombError:
-        error_msg = "Image is too large and may be a decompression bomb attack."
-        logger.exception(error_msg)
-        return None, error_msg
 
-    except OSError as e:
-        error_msg = f"OS error while processing image: {e!s}"
-        logger.exception(error_msg)
-        return None, error_msg
+def convert_image_renditions(
+    image_data: bytes,
+    widths: list[int],
+    formats: list[str],
+    quality: int = 85,
+    max_pixels: int | None = None,
+) -> tuple[dict[tuple[int, str], bytes] | None, str | None]:
+    """
+    Encode an image once per (width, format) pair, decoding it only once.
+
+    Args:
+        image_data: The raw bytes of the image to convert
+        widths: Target widths; images narrower than a width are not upscaled
+        formats: Keys of RENDITION_FORMATS, e.g. ["avif", "webp"]
+        quality: Encoder quality (1-100, default 85)
+        max_pixels: Optional budget of pixels to decode, as for
+            convert_image_to_webp
 
-    except MemoryError:
-        error_msg = "Not enough memory to process the image."
-        logger.exception(error_msg)
-        return None, error_msg
+    Returns:
+        A tuple of ({(width, format): bytes}, error_message), as for
+        convert_image_to_webp.
+    """
+    if not 1 <= quality <= 100:
+        return None, f"Quality must be between 1 and 100, got {quality}"
+    unknown_formats = set(formats) - RENDITION_FORMATS.keys()
+    if unknown_formats:
+        return None, f"Unsupported rendition formats: {sorted(unknown_formats)}"
+
+    try:
+        baseline_rss = _reset_peak_rss()
+        source = _open_image(image_data, max(widths, default=None), None, max_pixels)
+        decoded = _decoded_info(source)
+        source = _flatten_image(source)
+        renditions = {}
+        # Largest first, so each width is resized from the closest larger one
+        image = source
+        for width in sorted(set(widths), reverse=True):
+            image = _resize_to_fit(image, width, None)
+            for rendition_format in formats:
+                pillow_format, options = RENDITION_FORMATS[rendition_format]
+                output = io.BytesIO()
+                image.save(output, format=pillow_format, quality=quality, **options)
+                renditions[width, rendition_format] = output.getvalue()
+        _log_memory(decoded, baseline_rss, source_bytes=len(image_data))
+
+        logger.info(
+            "Generated image renditions",
+            extra={"widths": sorted(set(widths)), "formats": formats},
+        )
+        return renditions, None
 
     except Exception as e:
-        error_msg = f"Unexpected error converting image to WebP: {e!s}"
-        logger.exception(error_msg)
-        return None, error_msg
+        return None, _conversion_error(e)
@@ -1,73 +1,232 @@
+"""
+Streaming SVG validation.
+
+The document is fed to defusedxml's expat parser in chunks, and every element
+is checked as soon as its start tag is parsed: a violation stops parsing there,
+without reading the rest of the upload or building a tree. Size, element count
+and nesting depth are capped, so oversized documents fail early too.
+
+is_safe_svg() accepts or rejects. sanitize_svg() instead drops offending
+elements (with their content) and attributes, and returns the cleaned SVG.
+"""
+
 import logging
 import re
+from xml.etree.ElementTree import TreeBuilder, register_namespace, tostring
 
-from defusedxml.ElementTree import ParseError, fromstring
+from defusedxml import DefusedXmlException
+from defusedxml.ElementTree import ParseError, XMLParser
 
 logger = logging.getLogger(__name__)
 
+SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+XLINK_NAMESPACE = "http://www.w3.org/1999/xlink"
+# Keep the usual prefixes when sanitized documents are serialized
+register_namespace("", SVG_NAMESPACE)
+register_namespace("xlink", XLINK_NAMESPACE)
 
-def is_safe_svg(file_content_bytes):
-    """
-    Validates SVG content using defusedxml and performs basic XSS sanitization checks.
+CHUNK_SIZE = 64 * 1024
 
-    Args:
-        file_content_bytes (bytes): The raw bytes content of the SVG file.
+MAX_BYTES = 5 * 1024 * 1024
+MAX_ELEMENTS = 50_000
+MAX_DEPTH = 100
 
-    Returns:
-        tuple: (bool, str) - True if safe, False otherwise, and an error message.
+DANGEROUS_HREF = re.compile(r"\s*(javascript|data|vbscript):", re.IGNORECASE)
+DANGEROUS_STYLE_URL = re.compile(
+    r"url\s*\(\s*['\"]?\s*(javascript|data|vbscript):", re.IGNORECASE
+)
+
+
+class SvgViolation(Exception):  # noqa: N818
+    """Raised from the parser callbacks to stop at the first violation."""
+
+
+def _local_name(name: str) -> str:
+    # "{http://www.w3.org/2000/svg}script" -> "script"
+    return name.rpartition("}")[2].lower()
+
+
+def _attribute_error(name: str, value: str) -> str | None:
+    local_name = _local_name(name)
+    # Check for event handlers (e.g., onload, onclick, onerror)
+    if local_name.startswith("on"):
+        return f"Invalid SVG file: contains disallowed event handler '{name}'."
+    # Covers href and xlink:href
+    if local_name == "href" and DANGEROUS_HREF.match(value):
+        return (
+            f"Invalid SVG file: contains dangerous href '{name}' "
+            f"with value '{value.strip().lower()}'."
+        )
+    if local_name == "style" and DANGEROUS_STYLE_URL.search(value):
+        return "Invalid SVG file: contains a dangerous url() in a style attribute."
+    return None
+
+
+class _SvgTarget:
     """
-    try:
-        # Use defusedxml for secure XML parsing (prevents XXE, XML bombs, etc.)
-        root = fromstring(file_content_bytes)
+    Parser target checking elements as they are parsed. When sanitizing, the
+    elements and attributes that pass are also built into a tree.
+    """
+
+    def __init__(self, *, sanitize: bool, max_elements: int, max_depth: int):
+        self.sanitize = sanitize
+        self.max_elements = max_elements
+        self.max_depth = max_depth
+        self.builder = TreeBuilder() if sanitize else None
+        self.elements = 0
+        self.depth = 0
+        # Depth of the removed element whose content is being skipped
+        self.skip_depth = None
+        self.removed = []
 
-        # 1. Basic SVG root tag validation
+    def _violation(self, message: str):
+        if not self.sanitize:
+            raise SvgViolation(message)
+        self.removed.append(message)
+
+    def start(self, tag, attrib):
+        self.elements += 1
+        self.depth += 1
+        if self.elements > self.max_elements:
+            raise SvgViolation(
+                f"Invalid SVG file: more than {self.max_elements} elements."
+            )
+        if self.depth > self.max_depth:
+            raise SvgViolation(
+                f"Invalid SVG file: elements nested more than {self.max_depth} deep."
+            )
         # Ensure it's actually an SVG and not some other XML masquerading as SVG
-        # Handles namespaces by checking if the tag name ends with 'svg'
-        if not root.tag.endswith("svg"):
-            return False, "Invalid SVG file: root tag is not '<svg>'."
-
-        # 2. XSS Sanitization: Iterate through all elements and attributes
-        for elem in root.iter():
-            # Check for <script> tags
-            if elem.tag.endswith("script"):
-                return (
-                    False,
-                    f"Invalid SVG file: contains disallowed <script> tag at {elem.tag}.",
-                )
-
-            for attr_name in elem.attrib:
-                # Check for event handlers (e.g., onload, onclick, onerror)
-                if attr_name.lower().startswith("on"):
-                    return (
-                        False,
-                        f"Invalid SVG file: contains disallowed event handler '{attr_name}'.",
-                    )
-
-                # Further checks for dangerous href/xlink:href attributes if necessary
-                # This regex checks for 'javascript:', 'data:', or 'vbscript:' in hrefs, case-insensitive
-                if attr_name.lower().endswith("href"):  # Covers href and xlink:href
-                    href_value = elem.attrib[attr_name].lower().strip()
-                    if re.match(r"^(javascript|data|vbscript):", href_value):
-                        return (
-                            False,
-                            f"Invalid SVG file: contains dangerous href '{attr_name}' with value '{href_value}'.",
-                        )
-
-                # Check for style attributes containing 'url()' with dangerous schemes
-                if attr_name.lower() == "style":
-                    style_value = elem.attrib[attr_name].lower()
-                    if re.search(r"url\s*\(", style_value):  # If style contains url()
-                        # This is a very basic check, a more robust one would parse the URL
-                        # and check its scheme, but catching any url() is a good start if not expected
-                        # More specific checks for url(javascript:...) would be more robust.
-                        pass  # For now, allow url() but be aware of its potential danger if unsanitized.
-        return True, ""  # SVG is considered safe
-
-    except ParseError as e:
+        if self.elements == 1 and _local_name(tag) != "svg":
+            raise SvgViolation("Invalid SVG file: root tag is not '<svg>'.")
+        if self.skip_depth is not None:
+            return
+
+        if _local_name(tag) == "script":
+            self._violation(
+                f"Invalid SVG file: contains disallowed <script> tag at {tag}."
+            )
+            self.skip_depth = self.depth
+            return
+
+        kept = {}
+        for name, value in attrib.items():
+            error = _attribute_error(name, value)
+            if error:
+                self._violation(error)
+            else:
+                kept[name] = value
+        if self.builder is not None:
+            self.builder.start(tag, kept)
+
+    def end(self, tag):
+        if self.skip_depth is None:
+            if self.builder is not None:
+                self.builder.end(tag)
+        elif self.depth == self.skip_depth:
+            self.skip_depth = None
+        self.depth -= 1
+
+    def data(self, data):
+        if self.builder is not None and self.skip_depth is None:
+            self.builder.data(data)
+
+    def close(self):
+        return self.builder.close() if self.builder is not None else None
+
+
+def _chunks(content):
+    # Uploaded files are read chunk by chunk, stopping with the parser
+    if isinstance(content, bytes | bytearray | memoryview):
+        content = memoryview(content)
+        for offset in range(0, len(content), CHUNK_SIZE):
+            yield content[offset : offset + CHUNK_SIZE].tobytes()
+    else:
+        while chunk := content.read(CHUNK_SIZE):
+            yield chunk
+
+
+def _scan(content, target: _SvgTarget, max_bytes: int):
+    parser = XMLParser(target=target)
+    size = 0
+    for chunk in _chunks(content):
+        size += len(chunk)
+        if size > max_bytes:
+            raise SvgViolation(f"Invalid SVG file: larger than {max_bytes} bytes.")
+        parser.feed(chunk)
+    return parser.close()
+
+
+def _check(content, *, sanitize: bool, max_bytes, max_elements, max_depth):
+    """
+    Returns (target, root, error_message); error_message is empty on success.
+    """
+    target = _SvgTarget(
+        sanitize=sanitize, max_elements=max_elements, max_depth=max_depth
+    )
+    try:
+        root = _scan(content, target, max_bytes)
+    except SvgViolation as e:
+        return target, None, str(e)
+    except (ParseError, DefusedXmlException) as e:
         # This catches XML parsing errors (e.g., malformed XML, XML bombs, XXE attempts)
-        logger.exception("DefusedXML Parse Error for SVG: %s", e)
-        return False, "Invalid or malicious XML structure detected in SVG."
+        logger.warning("DefusedXML Parse Error for SVG: %s", e)
+        return target, None, "Invalid or malicious XML structure detected in SVG."
     except Exception as e:
         # Catch any other unexpected errors during SVG processing
         logger.exception("An unexpected error occurred during SVG safety check: %s", e)
-        return False, "Failed to perform SVG safety checks."
+        return target, None, "Failed to perform SVG safety checks."
+    return target, root, ""
+
+
+def is_safe_svg(
+    file_content_bytes,
+    *,
+    max_bytes: int = MAX_BYTES,
+    max_elements: int = MAX_ELEMENTS,
+    max_depth: int = MAX_DEPTH,
+):
+    """
+    Validates SVG content using defusedxml and performs basic XSS sanitization checks.
+
+    Args:
+        file_content_bytes (bytes | file): The SVG, as bytes or a binary file.
+        max_bytes, max_elements, max_depth: Limits, exceeding one is a violation.
+
+    Returns:
+        tuple: (bool, str) - True if safe, False otherwise, and an error message.
+    """
+    _target, _root, error_msg = _check(
+        file_content_bytes,
+        sanitize=False,
+        max_bytes=max_bytes,
+        max_elements=max_elements,
+        max_depth=max_depth,
+    )
+    return not error_msg, error_msg
+
+
+def sanitize_svg(
+    file_content_bytes,
+    *,
+    max_bytes: int = MAX_BYTES,
+    max_elements: int = MAX_ELEMENTS,
+    max_depth: int = MAX_DEPTH,
+):
+    """
+    Strips the script elements, event handlers and dangerous URLs is_safe_svg
+    rejects. Malformed XML and exceeded limits are still errors.
+
+    Returns:
+        tuple: (bytes | None, list[str], str) - the sanitized SVG (None on
+        error), what was removed, and an error message.
+    """
+    target, root, error_msg = _check(
+        file_content_bytes,
+        sanitize=True,
+        max_bytes=max_bytes,
+        max_elements=max_elements,
+        max_depth=max_depth,
+    )
+    if error_msg:
+        return None, target.removed, error_msg
+    return tostring(root, encoding="utf-8"), target.removed, ""
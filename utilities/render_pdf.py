@@ -0,0 +1,14 @@
+def render_pdf(html_string: str, base_url: str) -> bytes:
+    """
+    Render an HTML document to PDF bytes. Runs inside the render process
+    pool, so it must not depend on Django being set up.
+    """
+    # WeasyPrint is only used in PDF generation and requires heavy system dependencies
+    # (Cairo, Pango, etc.) that are not installed in local dev environments.
+    # To avoid breaking commands like `makemigrations` locally, we import it lazily
+    # inside the function where it's needed. This ensures Docker/prod environments
+    # still have full PDF functionality without forcing all developers to install
+    # the extra dependencies locally.
+    from weasyprint import HTML
+
+    return HTML(string=html_string, base_url=base_url).write_pdf()
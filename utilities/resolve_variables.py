@@ -1,6 +1,78 @@
+import hashlib
 import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
 from typing import Any
 
+VARIABLE_PATTERN = re.compile(r"\{variable\.([A-Z][A-Z0-9_]*(?:\.[A-Z0-9_]+)*)\}")
+
+# Compiled templates kept per process, keyed by a hash of their source
+COMPILED_CACHE_SIZE = 128
+
+
+class CompiledTemplate:
+    """
+    An input string parsed once into literal and variable segments. Variables
+    are stored as (lowercased key path, original placeholder) so rendering is
+    a single join with no regex work.
+    """
+
+    __slots__ = ("segments",)
+
+    def __init__(self, input_string: str):
+        segments: list[str | tuple[tuple[str, ...], str]] = []
+        position = 0
+        for match in VARIABLE_PATTERN.finditer(input_string):
+            if match.start() > position:
+                segments.append(input_string[position : match.start()])
+            keys = tuple(key.lower() for key in match.group(1).split("."))
+            segments.append((keys, match.group(0)))
+            position = match.end()
+        if position < len(input_string):
+            segments.append(input_string[position:])
+        self.segments = tuple(segments)
+
+    def render(self, lookup_dict: dict[str, Any]) -> str:
+        return "".join(
+            segment
+            if isinstance(segment, str)
+            else self._resolve(lookup_dict, *segment)
+            for segment in self.segments
+        )
+
+    @staticmethod
+    def _resolve(current: Any, keys: tuple[str, ...], placeholder: str) -> str:
+        for key in keys:
+            if not isinstance(current, dict) or key not in current:
+                return placeholder
+            current = current[key]
+        return str(current) if current is not None else placeholder
+
+
+_compiled_templates: OrderedDict[str, CompiledTemplate] = OrderedDict()
+_compiled_templates_lock = threading.Lock()
+
+
+def compile_template(input_string: str) -> CompiledTemplate:
+    """
+    Return the compiled form of input_string, parsing it only the first time
+    this content is seen by the process.
+    """
+    digest = hashlib.blake2b(input_string.encode(), digest_size=16).hexdigest()
+    with _compiled_templates_lock:
+        template = _compiled_templates.get(digest)
+        if template is not None:
+            _compiled_templates.move_to_end(digest)
+            return template
+
+    template = CompiledTemplate(input_string)
+    with _compiled_templates_lock:
+        _compiled_templates[digest] = template
+        if len(_compiled_templates) > COMPILED_CACHE_SIZE:
+            _compiled_templates.popitem(last=False)
+    return template
+
 
 class VariableResolver:
     def __init__(self, input_string: str, lookup_dict: dict[str, Any]):
@@ -14,21 +86,18 @@ class VariableResolver:
 
     @property
     def pattern(self) -> re.Pattern:
-        return re.compile(r"\{variable\.([A-Z][A-Z0-9_]*(?:\.[A-Z0-9_]+)*)\}")
+        return VARIABLE_PATTERN
 
     def resolve(self) -> str:
-        return self.pattern.sub(self._replacer, self.input_string)
+        return compile_template(self.input_string).render(self.lookup_dict)
 
-    def _replacer(self, match: re.Match) -> str:
-        path = match.group(1)
-        keys = path.split(".")
-        value = self._get_nested_value(self.lookup_dict, keys)
-        return str(value) if value is not None else match.group(0)
-
-    def _get_nested_value(self, current: Any, keys: list[str]) -> Any | None:
-        for key in keys:
-            lower_key = key.lower()
-            if not isinstance(current, dict) or lower_key not in current:
-                return None
-            current = current[lower_key]
-        return current
+    @classmethod
+    def resolve_many(
+        cls, input_strings: Iterable[str], lookup_dict: dict[str, Any]
+    ) -> list[str]:
+        """
+        Resolve several documents against the same lookup dictionary.
+        """
+        return [
+            cls(input_string, lookup_dict).resolve() for input_string in input_strings
+        ]